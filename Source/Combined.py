@@ -32,16 +32,16 @@
 #    3. **Data Generation Functions:** Several functions are defined to generate fake data for different tables in the database. Each function follows a similar structure where it uses the Faker library to create realistic data for specific attributes of the tables. Functions like generate_cars_data, generate_owners_data, generate_ownership_history_data, generate_vehicle_condition_data, generate_features_data, generate_incidents_data, generate_service_history_data, and generate_market_trends_data are defined for generating data for respective tables like Cars, Owners, OwnershipHistory, VehicleCondition, Features, Incidents, ServiceHistory, and MarketTrends.
 #    
 #     
-#    4. **Database Connection:** The script establishes a connection to the MySQL database named dtsc_vehicles. It provides the host, username, password, and database name for establishing the connection.
+#    4. **Database Connection:** The script establishes a connection to the MySQL database named dtsc_vehicles. The host, username, password, and database name are configured once in db_connection.py, and each table borrows a connection from its shared pool instead of opening a new one.
 #    
 #     
-#    5. **Data Insertion:** For each table, the script generates fake data using the corresponding data generation function. It then constructs an SQL INSERT query to insert the generated data into the respective table. The executemany() method is used to execute the INSERT query for bulk insertion of data. After insertion, the changes are committed to the database using conn.commit().
+#    5. **Data Insertion:** For each table, the script generates fake data using the corresponding data generation function. It then constructs an SQL INSERT query to insert the generated data into the respective table. insert_batched() from bulk_loader.py runs the INSERT query with executemany() in batches of COMMIT_BATCH_ROWS rows, committing each batch and recording the last committed ID in a checkpoint file, so an interrupted load resumes where it stopped. With DTSC_LOAD_DATA=1, bulk_load_table() loads each table with a single LOAD DATA LOCAL INFILE statement instead.
 #    
 #     
 #    6. **Error Handling:** Exception handling is implemented to catch any errors that may occur during data insertion. If an error occurs, it prints an error message indicating the nature of the error. Regardless of whether an error occurs or not, the script ensures that the database connection is properly closed after data insertion.
 #    
 #     
-#    7. **Closing Database Connection:** After completing data insertion for each table, the script closes the cursor and the database connection using cursor.close() and conn.close() respectively.
+#    7. **Closing Database Connection:** After completing data insertion for each table, the script returns the connection to the pool using conn.close().
 #    
 #     
 # Overall, this script automates the process of populating a MySQL database with synthetic data, facilitating database testing, development, or educational purposes related to the automotive domain.
@@ -57,8 +57,12 @@
 # ---------------------------------------------------------------------------------------------------------------------------
 from faker import Faker
 from faker_vehicle import VehicleProvider
+import os
 import random
 import mysql.connector
+from db_connection import get_connection
+from bulk_loader import bulk_load_table, insert_batched, COMMIT_BATCH_ROWS
+from load_metrics import LoadMetrics, print_report, save_report
 
 
 # 2. Seeding Randomness and Faker maintenance
@@ -68,6 +72,14 @@ fake.add_provider(VehicleProvider)
 Faker.seed(0)
 random.seed(0)
 
+# Collects rows/sec, batch latencies, bytes sent and retries for every table inserted below
+load_metrics = LoadMetrics()
+
+# Set DTSC_LOAD_DATA=1 to load every table below with LOAD DATA LOCAL INFILE (bulk_load_table) over a connection from the
+# loading pool, instead of executemany() batches. The server needs local_infile=ON; otherwise bulk_load_table falls back
+# to multi-row INSERTs. The batched inserts stay the default because only they checkpoint and resume an interrupted load.
+USE_LOAD_DATA = os.environ.get('DTSC_LOAD_DATA') == '1'
+
 
 # In[2]:
 
@@ -232,15 +244,12 @@ def generate_market_trends_data(num_records):
 # In[10]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -255,36 +264,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     cars_data = generate_cars_data(2000)
     insert_query = "INSERT INTO Cars (CarID, Make, Model, Year, Mileage, VIN, EngineType, TransmissionType, FuelType) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
 
-    # Inserting data for Cars table using executemany()
-    cursor.executemany(insert_query, cars_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the Cars table in one LOAD DATA statement
+        bulk_load_table(conn, 'Cars', cars_data, metrics=load_metrics)
+    else:
+        # Inserting data for Cars table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'Cars', cars_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[11]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -299,35 +306,33 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     owners_data = generate_owners_data(3000)
     insert_query = "INSERT INTO Owners (OwnerId, CarID, FirstName, LastName, ContactInfo, State) VALUES (%s, %s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, owners_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the Owners table in one LOAD DATA statement
+        bulk_load_table(conn, 'Owners', owners_data, metrics=load_metrics)
+    else:
+        # Inserting data for Owners table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'Owners', owners_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[12]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -342,36 +347,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     ownership_history_data = generate_ownership_history_data(3000)
     insert_query = "INSERT INTO OwnershipHistory (OwnershipID, CarID, OwnerID, PurchaseDate, SaleDate, SalePrice) VALUES (%s, %s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, ownership_history_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the OwnershipHistory table in one LOAD DATA statement
+        bulk_load_table(conn, 'OwnershipHistory', ownership_history_data, metrics=load_metrics)
+    else:
+        # Inserting data for OwnershipHistory table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'OwnershipHistory', ownership_history_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[13]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -386,36 +389,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     vehicle_condition_data = generate_vehicle_condition_data(2000)
     insert_query = "INSERT INTO VehicleCondition (ConditionID, CarID, OverallCondition, ExteriorCondition, InteriorCondition) VALUES (%s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, vehicle_condition_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the VehicleCondition table in one LOAD DATA statement
+        bulk_load_table(conn, 'VehicleCondition', vehicle_condition_data, metrics=load_metrics)
+    else:
+        # Inserting data for VehicleCondition table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'VehicleCondition', vehicle_condition_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[14]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -430,36 +431,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     feature_data = generate_features_data(10000)
     insert_query = "INSERT INTO Features (FeatureID, CarID, FeatureName, FeatureValue) VALUES (%s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, feature_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the Features table in one LOAD DATA statement
+        bulk_load_table(conn, 'Features', feature_data, metrics=load_metrics)
+    else:
+        # Inserting data for Features table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'Features', feature_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[15]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -474,36 +473,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     incidents_data = generate_incidents_data(1500)
     insert_query = "INSERT INTO Incidents (IncidentID, CarID, IncidentDate, Description, Cost) VALUES (%s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, incidents_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the Incidents table in one LOAD DATA statement
+        bulk_load_table(conn, 'Incidents', incidents_data, metrics=load_metrics)
+    else:
+        # Inserting data for Incidents table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'Incidents', incidents_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[16]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -518,36 +515,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     service_history_data = generate_service_history_data(4500)
     insert_query = "INSERT INTO ServiceHistory (ServiceID, CarID, ServiceDate, ServiceType, Cost) VALUES (%s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, service_history_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the ServiceHistory table in one LOAD DATA statement
+        bulk_load_table(conn, 'ServiceHistory', service_history_data, metrics=load_metrics)
+    else:
+        # Inserting data for ServiceHistory table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'ServiceHistory', service_history_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[17]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -562,24 +557,33 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     market_trends_data = generate_market_trends_data(2000)
     insert_query = "INSERT INTO MarketTrends (TrendID, CarID, Date, AverageSalePrice, MarketDemand) VALUES (%s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, market_trends_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the MarketTrends table in one LOAD DATA statement
+        bulk_load_table(conn, 'MarketTrends', market_trends_data, metrics=load_metrics)
+    else:
+        # Inserting data for MarketTrends table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'MarketTrends', market_trends_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
+# 8. Load report: per-table rows/sec, batch latency percentiles, bytes sent and retries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+load_report = load_metrics.report()
+print_report(load_report)
+save_report(load_report, stage='Database Data Insertion', batch_size=COMMIT_BATCH_ROWS)
+
+
 # ### **All of my data was inserted successfully into my SQL database.
 
 # # ----------------------------------- END Python Script -----------------------------------------------
@@ -631,6 +635,7 @@ finally:
 # ---------------------------------------------------------------------------------------------------------------------------
 
 ## import mysql.connector ## already imported
+from cleaning_rules import CLEANING_RULES, extract_clean_tables
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -642,28 +647,25 @@ import matplotlib.pyplot as plt
 # In[2]:
 
 
-# 2A. Connect to database for sunsequent data retrieval
+# 2A. Read all eight tables concurrently, each over its own connection to the storage backend named by DTSC_BACKEND
+#     (MySQL by default, or sqlite/duckdb to run without a server). The row filters of section 4 (mileage cut,
+#     ownership date range) are declared in cleaning_rules.py and applied in the SQL.
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+tables, thresholds = extract_clean_tables()
 
 
 # 2B. Actual data retrieval
 # ---------------------------------------------------------------------------------------------------------------------------
 
-Cars_df = pd.read_sql_query("SELECT * FROM Cars", conn)
-Owners_df = pd.read_sql_query("SELECT * FROM Owners", conn)
-OwnershipHistory_df = pd.read_sql_query("SELECT * FROM OwnershipHistory", conn)
-VehicleCondition_df = pd.read_sql_query("SELECT * FROM VehicleCondition", conn)
-Features_df = pd.read_sql_query("SELECT * FROM Features", conn)
-Incidents_df = pd.read_sql_query("SELECT * FROM Incidents", conn)
-ServiceHistory_df = pd.read_sql_query("SELECT * FROM ServiceHistory", conn)
-MarketTrends_df = pd.read_sql_query("SELECT * FROM MarketTrends", conn)
+Cars_df = tables['Cars']
+Owners_df = tables['Owners']
+OwnershipHistory_df = tables['OwnershipHistory']
+VehicleCondition_df = tables['VehicleCondition']
+Features_df = tables['Features']
+Incidents_df = tables['Incidents']
+ServiceHistory_df = tables['ServiceHistory']
+MarketTrends_df = tables['MarketTrends']
 
 
 # In[4]:
@@ -751,10 +753,10 @@ MarketTrends_missing_values
 # 4. Outlier Detection and Handling
 # ---------------------------------------------------------------------------------------------------------------------------
 
-# Visualize distribution of 'Mileage' using a box plot
+# Visualize distribution of 'Mileage' using a box plot (rows above the 99th percentile were already cut in 2A)
 plt.boxplot(Cars_df['Mileage'])
 plt.xlabel('Mileage')
-plt.title('Box Plot of Mileage')
+plt.title('Box Plot of Mileage (at or below the 99th percentile)')
 plt.show()
 
 
@@ -769,14 +771,11 @@ Cars_df.describe()
 
 # Filtering outliers from the 'Mileage' column
 
-mileage_threshold = Cars_df['Mileage'].quantile(0.99)
-Cars_df = Cars_df[Cars_df['Mileage'] <= mileage_threshold]
+# The cut at the 99th percentile of Mileage is declared in cleaning_rules.CLEANING_RULES and was applied by the database
+# when Cars_df was read in 2A, so the box plot and summary above already show the cleaned data. The threshold was
+# computed in SQL exactly like Cars_df['Mileage'].quantile(0.99) over the whole table:
 
-
-# In[18]:
-
-
-Cars_df.describe()
+thresholds[('Cars', 'Mileage')]
 
 
 # In[19]:
@@ -788,24 +787,9 @@ Cars_df.describe()
 # In[20]:
 
 
-# Check min date value
-OwnershipHistory_df['SaleDate'].min()
-
-
-# In[21]:
-
-
-# Check max date value
-OwnershipHistory_df['SaleDate'].max()
-
-
-# In[22]:
-
-
-# Create custom start and end date variables
+# Start and end date variables, taken from the date range declared in cleaning_rules.CLEANING_RULES
 
-start_date = pd.to_datetime('2020-01-01')
-end_date = pd.to_datetime('2024-01-01')
+start_date, end_date = (pd.to_datetime(date) for date in CLEANING_RULES['OwnershipHistory']['date_range']['SaleDate'])
 
 
 # In[23]:
@@ -813,21 +797,23 @@ end_date = pd.to_datetime('2024-01-01')
 
 # Filtering data based on specified date ranges
 
-OwnershipHistory_df = OwnershipHistory_df[(OwnershipHistory_df['PurchaseDate'] >= start_date) & (OwnershipHistory_df['PurchaseDate'] <= end_date)]
-OwnershipHistory_df = OwnershipHistory_df[(OwnershipHistory_df['SaleDate'] >= start_date) & (OwnershipHistory_df['SaleDate'] <= end_date)]
+# PurchaseDate and SaleDate between start_date and end_date (inclusive) are declared in cleaning_rules.CLEANING_RULES
+# and applied in the WHERE clause when OwnershipHistory_df is read in 2A, so only these rows leave the database.
+
+OwnershipHistory_df['SaleDate'].between(start_date, end_date).all()
 
 
 # In[24]:
 
 
-# Check min date value after change
+# Check min date value (between start_date and end_date)
 OwnershipHistory_df['SaleDate'].min()
 
 
 # In[25]:
 
 
-# Check max date value after change
+# Check max date value (between start_date and end_date)
 OwnershipHistory_df['SaleDate'].max()
 
 
@@ -1165,28 +1151,25 @@ from datetime import datetime
 # In[3]:
 
 
-# 2A. Connect to database for sunsequent data retrieval
+# 2A. Read all eight tables concurrently, each over its own connection to the storage backend named by DTSC_BACKEND
+#     (MySQL by default, or sqlite/duckdb to run without a server). The row filters of section 4 (mileage cut,
+#     ownership date range) are declared in cleaning_rules.py and applied in the SQL.
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+tables, thresholds = extract_clean_tables()
 
 
 # 2B. Actual data retrieval
 # ---------------------------------------------------------------------------------------------------------------------------
 
-Cars_df = pd.read_sql_query("SELECT * FROM Cars", conn)
-Owners_df = pd.read_sql_query("SELECT * FROM Owners", conn)
-OwnershipHistory_df = pd.read_sql_query("SELECT * FROM OwnershipHistory", conn)
-VehicleCondition_df = pd.read_sql_query("SELECT * FROM VehicleCondition", conn)
-Features_df = pd.read_sql_query("SELECT * FROM Features", conn)
-Incidents_df = pd.read_sql_query("SELECT * FROM Incidents", conn)
-ServiceHistory_df = pd.read_sql_query("SELECT * FROM ServiceHistory", conn)
-MarketTrends_df = pd.read_sql_query("SELECT * FROM MarketTrends", conn)
+Cars_df = tables['Cars']
+Owners_df = tables['Owners']
+OwnershipHistory_df = tables['OwnershipHistory']
+VehicleCondition_df = tables['VehicleCondition']
+Features_df = tables['Features']
+Incidents_df = tables['Incidents']
+ServiceHistory_df = tables['ServiceHistory']
+MarketTrends_df = tables['MarketTrends']
 
 
 # In[4]:
@@ -1280,10 +1263,10 @@ MarketTrends_missing_values
 # 4. Outlier Detection and Handling
 # ---------------------------------------------------------------------------------------------------------------------------
 
-# Visualize distribution of 'Mileage' using a box plot
+# Visualize distribution of 'Mileage' using a box plot (rows above the 99th percentile were already cut in 2A)
 plt.boxplot(Cars_df['Mileage'])
 plt.xlabel('Mileage')
-plt.title('Box Plot of Mileage')
+plt.title('Box Plot of Mileage (at or below the 99th percentile)')
 plt.show()
 
 
@@ -1298,14 +1281,11 @@ Cars_df.describe()
 
 # Filtering outliers from the 'Mileage' column
 
-mileage_threshold = Cars_df['Mileage'].quantile(0.99)
-Cars_df = Cars_df[Cars_df['Mileage'] <= mileage_threshold]
+# The cut at the 99th percentile of Mileage is declared in cleaning_rules.CLEANING_RULES and was applied by the database
+# when Cars_df was read in 2A, so the box plot and summary above already show the cleaned data. The threshold was
+# computed in SQL exactly like Cars_df['Mileage'].quantile(0.99) over the whole table:
 
-
-# In[19]:
-
-
-Cars_df.describe()
+thresholds[('Cars', 'Mileage')]
 
 
 # In[20]:
@@ -1317,24 +1297,9 @@ Cars_df.describe()
 # In[21]:
 
 
-# Check min date value
-OwnershipHistory_df['SaleDate'].min()
+# Start and end date variables, taken from the date range declared in cleaning_rules.CLEANING_RULES
 
-
-# In[22]:
-
-
-# Check max date value
-OwnershipHistory_df['SaleDate'].max()
-
-
-# In[23]:
-
-
-# Create custom start and end date variables
-
-start_date = pd.to_datetime('2020-01-01')
-end_date = pd.to_datetime('2024-01-01')
+start_date, end_date = (pd.to_datetime(date) for date in CLEANING_RULES['OwnershipHistory']['date_range']['SaleDate'])
 
 
 # In[24]:
@@ -1342,14 +1307,16 @@ end_date = pd.to_datetime('2024-01-01')
 
 # Filtering data based on specified date ranges
 
-OwnershipHistory_df = OwnershipHistory_df[(OwnershipHistory_df['PurchaseDate'] >= start_date) & (OwnershipHistory_df['PurchaseDate'] <= end_date)]
-OwnershipHistory_df = OwnershipHistory_df[(OwnershipHistory_df['SaleDate'] >= start_date) & (OwnershipHistory_df['SaleDate'] <= end_date)]
+# PurchaseDate and SaleDate between start_date and end_date (inclusive) are declared in cleaning_rules.CLEANING_RULES
+# and applied in the WHERE clause when OwnershipHistory_df is read in 2A, so only these rows leave the database.
+
+OwnershipHistory_df['SaleDate'].between(start_date, end_date).all()
 
 
 # In[25]:
 
 
-# Check min date value after change
+# Check min date value (between start_date and end_date)
 
 OwnershipHistory_df['SaleDate'].min()
 
@@ -1357,7 +1324,7 @@ OwnershipHistory_df['SaleDate'].min()
 # In[26]:
 
 
-# Check max date value after change
+# Check max date value (between start_date and end_date)
 
 OwnershipHistory_df['SaleDate'].max()
 
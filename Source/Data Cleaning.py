@@ -40,6 +40,7 @@
 # ---------------------------------------------------------------------------------------------------------------------------
 
 import mysql.connector
+from cleaning_rules import CLEANING_RULES, extract_clean_tables
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -51,28 +52,25 @@ import matplotlib.pyplot as plt
 # In[2]:
 
 
-# 2A. Connect to database for sunsequent data retrieval
+# 2A. Read all eight tables concurrently, each over its own connection to the storage backend named by DTSC_BACKEND
+#     (MySQL by default, or sqlite/duckdb to run without a server). The row filters of section 4 (mileage cut,
+#     ownership date range) are declared in cleaning_rules.py and applied in the SQL.
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+tables, thresholds = extract_clean_tables()
 
 
 # 2B. Actual data retrieval
 # ---------------------------------------------------------------------------------------------------------------------------
 
-Cars_df = pd.read_sql_query("SELECT * FROM Cars", conn)
-Owners_df = pd.read_sql_query("SELECT * FROM Owners", conn)
-OwnershipHistory_df = pd.read_sql_query("SELECT * FROM OwnershipHistory", conn)
-VehicleCondition_df = pd.read_sql_query("SELECT * FROM VehicleCondition", conn)
-Features_df = pd.read_sql_query("SELECT * FROM Features", conn)
-Incidents_df = pd.read_sql_query("SELECT * FROM Incidents", conn)
-ServiceHistory_df = pd.read_sql_query("SELECT * FROM ServiceHistory", conn)
-MarketTrends_df = pd.read_sql_query("SELECT * FROM MarketTrends", conn)
+Cars_df = tables['Cars']
+Owners_df = tables['Owners']
+OwnershipHistory_df = tables['OwnershipHistory']
+VehicleCondition_df = tables['VehicleCondition']
+Features_df = tables['Features']
+Incidents_df = tables['Incidents']
+ServiceHistory_df = tables['ServiceHistory']
+MarketTrends_df = tables['MarketTrends']
 
 
 # In[4]:
@@ -160,10 +158,10 @@ MarketTrends_missing_values
 # 4. Outlier Detection and Handling
 # ---------------------------------------------------------------------------------------------------------------------------
 
-# Visualize distribution of 'Mileage' using a box plot
+# Visualize distribution of 'Mileage' using a box plot (rows above the 99th percentile were already cut in 2A)
 plt.boxplot(Cars_df['Mileage'])
 plt.xlabel('Mileage')
-plt.title('Box Plot of Mileage')
+plt.title('Box Plot of Mileage (at or below the 99th percentile)')
 plt.show()
 
 
@@ -178,14 +176,11 @@ Cars_df.describe()
 
 # Filtering outliers from the 'Mileage' column
 
-mileage_threshold = Cars_df['Mileage'].quantile(0.99)
-Cars_df = Cars_df[Cars_df['Mileage'] <= mileage_threshold]
+# The cut at the 99th percentile of Mileage is declared in cleaning_rules.CLEANING_RULES and was applied by the database
+# when Cars_df was read in 2A, so the box plot and summary above already show the cleaned data. The threshold was
+# computed in SQL exactly like Cars_df['Mileage'].quantile(0.99) over the whole table:
 
-
-# In[18]:
-
-
-Cars_df.describe()
+thresholds[('Cars', 'Mileage')]
 
 
 # In[19]:
@@ -197,24 +192,9 @@ Cars_df.describe()
 # In[20]:
 
 
-# Check min date value
-OwnershipHistory_df['SaleDate'].min()
-
+# Start and end date variables, taken from the date range declared in cleaning_rules.CLEANING_RULES
 
-# In[21]:
-
-
-# Check max date value
-OwnershipHistory_df['SaleDate'].max()
-
-
-# In[22]:
-
-
-# Create custom start and end date variables
-
-start_date = pd.to_datetime('2020-01-01')
-end_date = pd.to_datetime('2024-01-01')
+start_date, end_date = (pd.to_datetime(date) for date in CLEANING_RULES['OwnershipHistory']['date_range']['SaleDate'])
 
 
 # In[23]:
@@ -222,21 +202,23 @@ end_date = pd.to_datetime('2024-01-01')
 
 # Filtering data based on specified date ranges
 
-OwnershipHistory_df = OwnershipHistory_df[(OwnershipHistory_df['PurchaseDate'] >= start_date) & (OwnershipHistory_df['PurchaseDate'] <= end_date)]
-OwnershipHistory_df = OwnershipHistory_df[(OwnershipHistory_df['SaleDate'] >= start_date) & (OwnershipHistory_df['SaleDate'] <= end_date)]
+# PurchaseDate and SaleDate between start_date and end_date (inclusive) are declared in cleaning_rules.CLEANING_RULES
+# and applied in the WHERE clause when OwnershipHistory_df is read in 2A, so only these rows leave the database.
+
+OwnershipHistory_df['SaleDate'].between(start_date, end_date).all()
 
 
 # In[24]:
 
 
-# Check min date value after change
+# Check min date value (between start_date and end_date)
 OwnershipHistory_df['SaleDate'].min()
 
 
 # In[25]:
 
 
-# Check max date value after change
+# Check max date value (between start_date and end_date)
 OwnershipHistory_df['SaleDate'].max()
 
 
@@ -14,16 +14,16 @@
 #    3. Data Generation Functions: Several functions are defined to generate fake data for different tables in the database. Each function follows a similar structure where it uses the Faker library to create realistic data for specific attributes of the tables. Functions like generate_cars_data, generate_owners_data, generate_ownership_history_data, generate_vehicle_condition_data, generate_features_data, generate_incidents_data, generate_service_history_data, and generate_market_trends_data are defined for generating data for respective tables like Cars, Owners, OwnershipHistory, VehicleCondition, Features, Incidents, ServiceHistory, and MarketTrends.
 #    
 #     
-#    4. Database Connection: The script establishes a connection to the MySQL database named dtsc_vehicles. It provides the host, username, password, and database name for establishing the connection.
+#    4. Database Connection: The script establishes a connection to the MySQL database named dtsc_vehicles. The host, username, password, and database name are configured once in db_connection.py, and each table borrows a connection from its shared pool instead of opening a new one.
 #    
 #     
-#    5. Data Insertion: For each table, the script generates fake data using the corresponding data generation function. It then constructs an SQL INSERT query to insert the generated data into the respective table. The executemany() method is used to execute the INSERT query for bulk insertion of data. After insertion, the changes are committed to the database using conn.commit().
+#    5. Data Insertion: For each table, the script generates fake data using the corresponding data generation function. It then constructs an SQL INSERT query to insert the generated data into the respective table. insert_batched() from bulk_loader.py runs the INSERT query with executemany() in batches of COMMIT_BATCH_ROWS rows, committing each batch and recording the last committed ID in a checkpoint file, so an interrupted load resumes where it stopped. With DTSC_LOAD_DATA=1, bulk_load_table() loads each table with a single LOAD DATA LOCAL INFILE statement instead.
 #    
 #     
 #    6. Error Handling: Exception handling is implemented to catch any errors that may occur during data insertion. If an error occurs, it prints an error message indicating the nature of the error. Regardless of whether an error occurs or not, the script ensures that the database connection is properly closed after data insertion.
 #    
 #     
-#    7. Closing Database Connection: After completing data insertion for each table, the script closes the cursor and the database connection using cursor.close() and conn.close() respectively.
+#    7. Closing Database Connection: After completing data insertion for each table, the script returns the connection to the pool using conn.close().
 #    
 #     
 # Overall, this script automates the process of populating a MySQL database with synthetic data, facilitating database testing, development, or educational purposes related to the automotive domain.
@@ -39,8 +39,12 @@
 # ---------------------------------------------------------------------------------------------------------------------------
 from faker import Faker
 from faker_vehicle import VehicleProvider
+import os
 import random
 import mysql.connector
+from db_connection import get_connection
+from bulk_loader import bulk_load_table, insert_batched, COMMIT_BATCH_ROWS
+from load_metrics import LoadMetrics, print_report, save_report
 
 
 # 2. Seeding Randomness and Faker maintenance
@@ -50,6 +54,14 @@ fake.add_provider(VehicleProvider)
 Faker.seed(0)
 random.seed(0)
 
+# Collects rows/sec, batch latencies, bytes sent and retries for every table inserted below
+load_metrics = LoadMetrics()
+
+# Set DTSC_LOAD_DATA=1 to load every table below with LOAD DATA LOCAL INFILE (bulk_load_table) over a connection from the
+# loading pool, instead of executemany() batches. The server needs local_infile=ON; otherwise bulk_load_table falls back
+# to multi-row INSERTs. The batched inserts stay the default because only they checkpoint and resume an interrupted load.
+USE_LOAD_DATA = os.environ.get('DTSC_LOAD_DATA') == '1'
+
 
 # In[2]:
 
@@ -214,15 +226,12 @@ def generate_market_trends_data(num_records):
 # In[10]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -237,36 +246,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     cars_data = generate_cars_data(2000)
     insert_query = "INSERT INTO Cars (CarID, Make, Model, Year, Mileage, VIN, EngineType, TransmissionType, FuelType) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
 
-    # Inserting data for Cars table using executemany()
-    cursor.executemany(insert_query, cars_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the Cars table in one LOAD DATA statement
+        bulk_load_table(conn, 'Cars', cars_data, metrics=load_metrics)
+    else:
+        # Inserting data for Cars table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'Cars', cars_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[11]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -281,35 +288,33 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     owners_data = generate_owners_data(3000)
     insert_query = "INSERT INTO Owners (OwnerId, CarID, FirstName, LastName, ContactInfo, State) VALUES (%s, %s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, owners_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the Owners table in one LOAD DATA statement
+        bulk_load_table(conn, 'Owners', owners_data, metrics=load_metrics)
+    else:
+        # Inserting data for Owners table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'Owners', owners_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[12]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -324,36 +329,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     ownership_history_data = generate_ownership_history_data(3000)
     insert_query = "INSERT INTO OwnershipHistory (OwnershipID, CarID, OwnerID, PurchaseDate, SaleDate, SalePrice) VALUES (%s, %s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, ownership_history_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the OwnershipHistory table in one LOAD DATA statement
+        bulk_load_table(conn, 'OwnershipHistory', ownership_history_data, metrics=load_metrics)
+    else:
+        # Inserting data for OwnershipHistory table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'OwnershipHistory', ownership_history_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[13]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -368,36 +371,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     vehicle_condition_data = generate_vehicle_condition_data(2000)
     insert_query = "INSERT INTO VehicleCondition (ConditionID, CarID, OverallCondition, ExteriorCondition, InteriorCondition) VALUES (%s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, vehicle_condition_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the VehicleCondition table in one LOAD DATA statement
+        bulk_load_table(conn, 'VehicleCondition', vehicle_condition_data, metrics=load_metrics)
+    else:
+        # Inserting data for VehicleCondition table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'VehicleCondition', vehicle_condition_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[14]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -412,36 +413,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     feature_data = generate_features_data(10000)
     insert_query = "INSERT INTO Features (FeatureID, CarID, FeatureName, FeatureValue) VALUES (%s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, feature_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the Features table in one LOAD DATA statement
+        bulk_load_table(conn, 'Features', feature_data, metrics=load_metrics)
+    else:
+        # Inserting data for Features table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'Features', feature_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[15]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -456,36 +455,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     incidents_data = generate_incidents_data(1500)
     insert_query = "INSERT INTO Incidents (IncidentID, CarID, IncidentDate, Description, Cost) VALUES (%s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, incidents_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the Incidents table in one LOAD DATA statement
+        bulk_load_table(conn, 'Incidents', incidents_data, metrics=load_metrics)
+    else:
+        # Inserting data for Incidents table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'Incidents', incidents_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[16]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -500,36 +497,34 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     service_history_data = generate_service_history_data(4500)
     insert_query = "INSERT INTO ServiceHistory (ServiceID, CarID, ServiceDate, ServiceType, Cost) VALUES (%s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, service_history_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the ServiceHistory table in one LOAD DATA statement
+        bulk_load_table(conn, 'ServiceHistory', service_history_data, metrics=load_metrics)
+    else:
+        # Inserting data for ServiceHistory table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'ServiceHistory', service_history_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
 # In[17]:
 
 
-# 4. Using mysql.connector object to establish a connection to my SQL database 'dtsc691vehicles'
+# 4. Borrowing a connection to my SQL database 'dtsc691vehicles' from the shared connection pool
 # ---------------------------------------------------------------------------------------------------------------------------
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='paul_walker',
-    password='dtsc691root',
-    database='dtsc_vehicles'
-)
+# Borrowed from the shared pool in db_connection.py (the loading_connection() pool when USE_LOAD_DATA is set);
+# conn.close() returns it
+conn = get_connection(local_infile=USE_LOAD_DATA)
 
 
 # 5. Generating fake data and inserting into respective tables. 
@@ -544,24 +539,33 @@ conn = mysql.connector.connect(
 # 7. Closing Database Connection
 # ---------------------------------------------------------------------------------------------------------------------------
 
-cursor = conn.cursor()
 try:
     market_trends_data = generate_market_trends_data(2000)
     insert_query = "INSERT INTO MarketTrends (TrendID, CarID, Date, AverageSalePrice, MarketDemand) VALUES (%s, %s, %s, %s, %s)"
 
-    # Inserting data for Owners table using executemany()
-    cursor.executemany(insert_query, market_trends_data)
-    conn.commit()
+    if USE_LOAD_DATA:
+        # Loading the MarketTrends table in one LOAD DATA statement
+        bulk_load_table(conn, 'MarketTrends', market_trends_data, metrics=load_metrics)
+    else:
+        # Inserting data for MarketTrends table in batches, committing and checkpointing after each batch
+        insert_batched(conn, 'MarketTrends', market_trends_data, insert_query, batch_size=COMMIT_BATCH_ROWS, metrics=load_metrics)
 
     print("Data inserted successfully.")
 except mysql.connector.Error as e:
     print(f"Error inserting data: {e}")
 finally:
-    # Close cursor and connection
-    cursor.close()
+    # Return the connection to the pool
     conn.close()
 
 
+# 8. Load report: per-table rows/sec, batch latency percentiles, bytes sent and retries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+load_report = load_metrics.report()
+print_report(load_report)
+save_report(load_report, stage='Database Data Insertion', batch_size=COMMIT_BATCH_ROWS)
+
+
 # ### **All of my data was inserted successfully into my SQL database.
 
 # # ----------------------------------- END Python Script -----------------------------------------------
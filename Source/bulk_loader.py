@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module loads whole tables with LOAD DATA LOCAL INFILE, falling back to multi-row INSERTs, and inserts row batches
+# with checkpointed commits. MySQL errors are recognized by their error number, so it also imports without
+# mysql-connector-python.
+#
+#    Staging Files: a table (DataFrame, column dictionary or list of tuples) is written to a temporary tab-delimited file
+#    with backslash escaping, the default format LOAD DATA expects.
+#
+#    LOAD DATA LOCAL INFILE: the staged file is loaded in one statement. The connection has to come from
+#    db_connection.loading_connection() and the server needs local_infile=ON.
+#
+#    Multi-row INSERT Fallback: if LOAD DATA is not allowed on either side, the rows are sent as INSERT statements that
+#    carry many rows each.
+#
+#    Loading Tables: bulk_load_table() tries LOAD DATA first, then multi-row INSERTs, and reports the rows, seconds,
+#    rows per second and method used for each table.
+#
+#    Batched Commits with Checkpoints: insert_batched() commits every batch_size rows and records the last committed ID
+#    of the table in a JSON checkpoint file, so a rerun after a crash skips the rows up to that ID. The checkpoint is
+#    cleared once the last batch commits and ignored when the table is empty.
+#
+# Deadlocked batches, LOAD DATA statements and INSERT transactions are retried, and every loading function takes an
+# optional load_metrics.LoadMetrics instance that records each batch it sends.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import csv
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from dataset_builder import TABLE_ORDER
+from load_metrics import payload_bytes, run_with_retries
+from schema import base_table_name
+from vectorized_generation import TABLE_COLUMNS
+
+
+INSERT_BATCH_ROWS = 1000
+COMMIT_BATCH_ROWS = int(os.environ.get('DTSC_COMMIT_BATCH_ROWS', 10000))
+
+CHECKPOINT_PATH = os.environ.get('DTSC_CHECKPOINT_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                                                       'Data', 'load_checkpoint.json'))
+
+# MySQL error numbers meaning LOCAL INFILE is switched off on the server (1148, 3948) or the client (2068)
+LOCAL_INFILE_DISABLED_ERRORS = (1148, 2068, 3948)
+
+
+# 2. Staging files
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def to_frame(table, data):
+    # Accepts a DataFrame, a dictionary of column arrays or a list of row tuples in TABLE_COLUMNS order
+    columns = TABLE_COLUMNS[base_table_name(table)]
+    if isinstance(data, pd.DataFrame):
+        return data[columns]
+    if isinstance(data, dict):
+        return pd.DataFrame(data)[columns]
+    return pd.DataFrame(list(data), columns=columns)
+
+
+def _escape_text(frame):
+    # LOAD DATA reads backslash escapes, so backslashes, tabs and line breaks inside text values are escaped first
+    frame = frame.copy()
+    for column in frame.columns:
+        if pd.api.types.infer_dtype(frame[column], skipna=True) != 'string':
+            continue
+        frame[column] = (frame[column]
+                         .str.replace('\\', '\\\\', regex=False)
+                         .str.replace('\t', '\\t', regex=False)
+                         .str.replace('\n', '\\n', regex=False)
+                         .str.replace('\r', '\\r', regex=False))
+    return frame
+
+
+def write_staging_file(frame, directory=None):
+    handle, path = tempfile.mkstemp(suffix='.tsv', dir=directory)
+    os.close(handle)
+    _escape_text(frame).to_csv(path, sep='\t', header=False, index=False, na_rep='\\N', quoting=csv.QUOTE_NONE,
+                               lineterminator='\n', date_format='%Y-%m-%d')
+    return path
+
+
+# 3. LOAD DATA LOCAL INFILE
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def load_data_query(table, path, columns):
+    # The file name cannot be a query parameter, so it is written into the statement as a quoted literal
+    path = path.replace('\\', '/').replace("'", "\\'")
+    return (f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({', '.join(columns)})")
+
+
+def load_data_infile(conn, table, frame, staging_dir=None, metrics=None):
+    path = write_staging_file(frame, staging_dir)
+    cursor = conn.cursor()
+
+    def load():
+        cursor.execute(load_data_query(table, path, list(frame.columns)))
+        conn.commit()
+
+    try:
+        load_time = time.perf_counter()
+        run_with_retries(load, conn, table, metrics)
+        if metrics is not None:
+            metrics.record_batch(table, len(frame), time.perf_counter() - load_time, os.path.getsize(path))
+    finally:
+        cursor.close()
+        os.remove(path)
+
+
+# 4. Multi-row INSERT fallback
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def multirow_insert_query(table, columns, num_rows):
+    row = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ', '.join([row] * num_rows)
+
+
+def frame_to_rows(frame):
+    # Python values (int, float, str, datetime.date) that mysql.connector can bind, with NaN/NaT as None
+    columns = []
+    for column in frame.columns:
+        values = frame[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.date
+        columns.append(values.astype(object).where(values.notna(), None).tolist())
+    return list(zip(*columns))
+
+
+def insert_multirow(conn, table, frame, batch_rows=INSERT_BATCH_ROWS, metrics=None):
+    columns = list(frame.columns)
+    rows = frame_to_rows(frame)
+    full_query = multirow_insert_query(table, columns, batch_rows)
+    cursor = conn.cursor()
+
+    def insert_all():
+        # The batches share one transaction, so a deadlock rolls all of them back and the retry sends them all again
+        batches = []
+        for batch_start in range(0, len(rows), batch_rows):
+            batch = rows[batch_start:batch_start + batch_rows]
+            query = full_query if len(batch) == batch_rows else multirow_insert_query(table, columns, len(batch))
+            batch_time = time.perf_counter()
+            cursor.execute(query, [value for row in batch for value in row])
+            batches.append((len(batch), time.perf_counter() - batch_time, payload_bytes(query, batch)))
+        conn.commit()
+        return batches
+
+    try:
+        batches = run_with_retries(insert_all, conn, table, metrics)
+    finally:
+        cursor.close()
+    if metrics is not None:
+        # Recorded once the transaction has committed, so a retried attempt is not counted twice
+        for num_rows, seconds, bytes_sent in batches:
+            metrics.record_batch(table, num_rows, seconds, bytes_sent)
+
+
+# 5. Loading tables
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def bulk_load_table(conn, table, data, staging_dir=None, use_load_data=True, batch_rows=INSERT_BATCH_ROWS, metrics=None):
+    frame = to_frame(table, data)
+    start = time.perf_counter()
+    method = 'LOAD DATA'
+    if use_load_data:
+        try:
+            load_data_infile(conn, table, frame, staging_dir, metrics)
+        except Exception as e:
+            if getattr(e, 'errno', None) not in LOCAL_INFILE_DISABLED_ERRORS:
+                raise
+            # Nothing was loaded, so the whole table can go through INSERT batches instead
+            print(f"LOAD DATA not available for {table} ({e}); falling back to multi-row INSERT.")
+            conn.rollback()
+            use_load_data = False
+    if not use_load_data:
+        method = 'multi-row INSERT'
+        insert_multirow(conn, table, frame, batch_rows, metrics)
+    seconds = time.perf_counter() - start
+    report = {
+        'table': table,
+        'rows': len(frame),
+        'method': method,
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(len(frame) / seconds, 1) if seconds > 0 else None,
+    }
+    print(f"{table}: {len(frame):,} rows via {method} in {seconds:.2f}s ({report['rows_per_sec'] or 0:,.0f} rows/s)")
+    return report
+
+
+def bulk_load_dataset(conn, dataset, **kwargs):
+    # Loads a dictionary of tables (e.g. from dataset_builder.build_dataset) parents first
+    return [bulk_load_table(conn, table, dataset[table], **kwargs) for table in TABLE_ORDER if table in dataset]
+
+
+# 6. Batched commits with checkpoints
+# ---------------------------------------------------------------------------------------------------------------------------
+
+# Several tables may be loading at once and they all share one checkpoint file
+_checkpoint_lock = threading.Lock()
+
+
+def load_checkpoint(path=CHECKPOINT_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def _write_checkpoint(checkpoint, path):
+    # Written to a temporary file and renamed, so a crash never leaves a half-written checkpoint behind
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(suffix='.json', dir=directory)
+    with os.fdopen(handle, 'w') as file:
+        json.dump(checkpoint, file, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def save_checkpoint(table, last_id, path=CHECKPOINT_PATH):
+    with _checkpoint_lock:
+        checkpoint = load_checkpoint(path)
+        checkpoint[table] = int(last_id)
+        _write_checkpoint(checkpoint, path)
+
+
+def clear_checkpoint(tables=None, path=CHECKPOINT_PATH):
+    # Forget the progress of some (or all) tables, e.g. after truncating them for a fresh load
+    with _checkpoint_lock:
+        checkpoint = load_checkpoint(path)
+        for table in tables or list(checkpoint):
+            checkpoint.pop(table, None)
+        _write_checkpoint(checkpoint, path)
+
+
+def resume_point(conn, table, path=CHECKPOINT_PATH):
+    # The batch can be committed just before a crash stops the checkpoint from being written, so the table's own
+    # highest ID is used when it is ahead of the checkpoint
+    id_column = TABLE_COLUMNS[table][0]
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT MAX({id_column}) FROM {table}")
+        table_max = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+    # An empty table has been truncated or recreated since the checkpoint was written, so there is nothing to resume
+    if table_max is None:
+        return 0
+    return max(load_checkpoint(path).get(table, 0), table_max)
+
+
+def row_insert_query(table, columns):
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+
+def insert_batched(conn, table, data, insert_query=None, batch_size=COMMIT_BATCH_ROWS, checkpoint_path=CHECKPOINT_PATH,
+                   metrics=None):
+    # Rows must come in ascending ID order (as every generator produces them) for "last committed ID" to mark progress
+    rows = data if isinstance(data, list) else frame_to_rows(to_frame(table, data))
+    insert_query = insert_query or row_insert_query(table, TABLE_COLUMNS[table])
+    last_id = resume_point(conn, table, checkpoint_path)
+    pending = [row for row in rows if row[0] > last_id]
+    if last_id:
+        print(f"{table}: resuming after ID {last_id:,} ({len(rows) - len(pending):,} rows already committed)")
+
+    start = time.perf_counter()
+    cursor = conn.cursor()
+
+    def write_batch(batch):
+        cursor.executemany(insert_query, batch)
+        conn.commit()
+
+    try:
+        for batch_start in range(0, len(pending), batch_size):
+            batch = pending[batch_start:batch_start + batch_size]
+            batch_time = time.perf_counter()
+            run_with_retries(lambda: write_batch(batch), conn, table, metrics)
+            if metrics is not None:
+                metrics.record_batch(table, len(batch), time.perf_counter() - batch_time, payload_bytes(insert_query, batch))
+            save_checkpoint(table, batch[-1][0], checkpoint_path)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    # The table is complete, so a later run starts from the table's own contents rather than this load's progress
+    clear_checkpoint([table], checkpoint_path)
+    seconds = time.perf_counter() - start
+    report = {
+        'table': table,
+        'rows': len(pending),
+        'skipped': len(rows) - len(pending),
+        'batches': -(-len(pending) // batch_size),
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(len(pending) / seconds, 1) if seconds > 0 else None,
+    }
+    print(f"{table}: {len(pending):,} rows in {report['batches']} committed batches in {seconds:.2f}s")
+    return report
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
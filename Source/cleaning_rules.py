@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module declares the row filters of "Data Cleaning.py" once and turns them into the column lists and WHERE
+# clauses of the extraction queries, so only the rows and columns that survive cleaning leave the database.
+#
+#    Declaring the Rules: CLEANING_RULES maps each table to its rules:
+#       columns      - the columns to read (all of them when left out)
+#       date_range   - column -> (start, end), both ends included, like the pandas filter it replaces
+#       quantile_max - column -> q, keeping rows whose value is at most the column's q-quantile
+#
+#    Quantiles in SQL: the q-quantile is computed like pandas' default (linear) quantile: with n non-null values
+#    sorted, position (n - 1) * q falls between the values at offsets floor and floor + 1, and the result interpolates
+#    between them. COUNT() gives n and one ORDER BY ... LIMIT 2 OFFSET floor query returns the two values. As in the
+#    cleaning script, the quantile is taken over the whole table before any other filter.
+#
+#    Extracting Clean Tables: extract_clean_tables() reads all tables concurrently with extraction.extract_tables() and
+#    returns them together with the thresholds, so the cleaning scripts can show them. Without a connect function it
+#    reads from the storage backend named by DTSC_BACKEND (storage_backends.get_backend()).
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import math
+
+from extraction import extract_tables
+from storage_backends import get_backend
+
+
+# 2. Declaring the rules
+# ---------------------------------------------------------------------------------------------------------------------------
+
+CLEANING_RULES = {
+    'Cars': {
+        'quantile_max': {'Mileage': 0.99},
+    },
+    'OwnershipHistory': {
+        'date_range': {
+            'PurchaseDate': ('2020-01-01', '2024-01-01'),
+            'SaleDate': ('2020-01-01', '2024-01-01'),
+        },
+    },
+}
+
+
+# 3. Quantiles in SQL
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _fetch(conn, query, params=()):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def sql_quantile(conn, table, column, q):
+    count = _fetch(conn, f"SELECT COUNT({column}) FROM {table}")[0][0]
+    if not count:
+        return None
+    position = (count - 1) * q
+    offset = math.floor(position)
+    values = [float(row[0]) for row in _fetch(conn, f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL "
+                                                    f"ORDER BY {column} LIMIT 2 OFFSET {offset}")]
+    if len(values) == 1:
+        return values[0]
+    return values[0] + (values[1] - values[0]) * (position - offset)
+
+
+def compile_rules(conn, rules=None, placeholder='%s'):
+    # table -> keyword arguments for extraction.extract_table(), plus the thresholds that were computed
+    table_kwargs, thresholds = {}, {}
+    for table, rule in (CLEANING_RULES if rules is None else rules).items():
+        conditions, params = [], []
+        for column, (start, end) in rule.get('date_range', {}).items():
+            conditions.append(f"{column} >= {placeholder} AND {column} <= {placeholder}")
+            params.extend([start, end])
+        for column, q in rule.get('quantile_max', {}).items():
+            threshold = sql_quantile(conn, table, column, q)
+            thresholds[(table, column)] = threshold
+            if threshold is not None:
+                conditions.append(f"{column} <= {placeholder}")
+                params.append(threshold)
+        table_kwargs[table] = {
+            'columns': rule.get('columns'),
+            'where': ' AND '.join(conditions) or None,
+            'params': tuple(params),
+        }
+    return table_kwargs, thresholds
+
+
+# 4. Extracting clean tables
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def extract_clean_tables(rules=None, tables=None, connect=None, placeholder=None, **kwargs):
+    if connect is None:
+        # The backend named by DTSC_BACKEND (MySQL by default), so the cleaning scripts also run on SQLite or DuckDB
+        backend = get_backend()
+        connect, placeholder = backend.connect, placeholder or backend.placeholder
+    placeholder = placeholder or '%s'
+    # Returns the extracted tables and the thresholds they were cut at: (table, column) -> value
+    with connect() as conn:
+        table_kwargs, thresholds = compile_rules(conn, rules, placeholder)
+    return extract_tables(tables, connect, table_kwargs=table_kwargs, **kwargs), thresholds
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
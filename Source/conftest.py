@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Test Fixtures
+#
+# Shared pytest fixtures for the test_*.py files next to the modules (run with python -m pytest from Source/). The
+# loaders are written against mysql.connector, so the database tests run them on an in-memory SQLite database built
+# from SQL/Table_Creation.sql, behind a connection that accepts mysql.connector's %s placeholders.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+import datetime
+import sqlite3
+
+import pytest
+
+from schema import load_order, load_schema
+
+
+def _bindable(value):
+    # sqlite3 has no DATE type; dates are stored as ISO strings, as the SQLite backend does
+    return value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else value
+
+
+class MySQLStyleCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, query, params=()):
+        self._cursor.execute(query.replace('%s', '?'), tuple(_bindable(value) for value in params or ()))
+
+    def executemany(self, query, rows):
+        self._cursor.executemany(query.replace('%s', '?'), [tuple(_bindable(value) for value in row) for row in rows])
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def close(self):
+        self._cursor.close()
+
+
+class MySQLStyleConnection:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def cursor(self, **kwargs):
+        return MySQLStyleCursor(self.conn.cursor())
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.conn.close()
+
+
+def create_tables(conn):
+    schema = load_schema()
+    for table in load_order(schema):
+        conn.execute(schema[table]['create_sql'].rstrip().rstrip(';'))
+    conn.commit()
+
+
+@pytest.fixture
+def mysql_style_conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('PRAGMA foreign_keys = ON')
+    create_tables(conn)
+    yield MySQLStyleConnection(conn)
+    conn.close()
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module builds all eight tables from a single TPC-H style scale factor (SF1, SF10, SF100, ...). SF1 gives the
+# table sizes of "Database Data Insertion.py" and every other scale factor multiplies all of them by the same amount.
+#
+#    Table Sizes: the SF1 row counts and the helpers that turn a scale factor into row counts for every table.
+#
+#    Dataset Generation: tables are generated parents first, with the child tables drawing their foreign keys from the
+#    parents' key ranges. build_dataset() returns eight DataFrames and iter_dataset() streams the same data as
+#    (table, chunk) pairs. Extra keyword arguments (end_date, skew) reach only the generating functions that accept them.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import inspect
+
+import numpy as np
+import pandas as pd
+
+from sharded_generation import SHARD_SIZE, generate_table_sharded, iter_table_chunks
+from vectorized_generation import GENERATORS
+
+
+# 2. Table sizes
+# ---------------------------------------------------------------------------------------------------------------------------
+
+# Row counts at scale factor 1, as inserted by "Database Data Insertion.py". Parents come before their children.
+SF1_TABLE_SIZES = {
+    'Cars': 2000,
+    'Owners': 3000,
+    'OwnershipHistory': 3000,
+    'VehicleCondition': 2000,
+    'Features': 10000,
+    'Incidents': 1500,
+    'ServiceHistory': 4500,
+    'MarketTrends': 2000,
+}
+
+TABLE_ORDER = list(SF1_TABLE_SIZES)
+
+
+def parse_scale_factor(scale_factor):
+    # Accepts 10, 0.5, '10' or 'SF10'
+    if isinstance(scale_factor, str):
+        scale_factor = scale_factor.strip().upper()
+        if scale_factor.startswith('SF'):
+            scale_factor = scale_factor[2:]
+    scale_factor = float(scale_factor)
+    if scale_factor <= 0:
+        raise ValueError(f"Scale factor must be positive, got {scale_factor}")
+    return scale_factor
+
+
+def table_sizes(scale_factor=1):
+    scale_factor = parse_scale_factor(scale_factor)
+    return {table: max(1, int(round(size * scale_factor))) for table, size in SF1_TABLE_SIZES.items()}
+
+
+# 3. Dataset generation
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _table_kwargs(table, sizes, kwargs):
+    # IDs are generated as 1..N, so the parent key arrays follow directly from the parent table sizes
+    car_ids = np.arange(1, sizes['Cars'] + 1, dtype=np.int64)
+    owner_ids = np.arange(1, sizes['Owners'] + 1, dtype=np.int64)
+    if table == 'Cars':
+        table_kwargs = {}
+    elif table == 'OwnershipHistory':
+        table_kwargs = {'car_ids': car_ids, 'owner_ids': owner_ids}
+    else:
+        table_kwargs = {'car_ids': car_ids}
+    # Options that only some tables take (e.g. end_date, which Cars and Owners have no use for) are left out for the rest
+    accepted = inspect.signature(GENERATORS[table]).parameters
+    table_kwargs.update({name: value for name, value in kwargs.items() if name in accepted})
+    return table_kwargs
+
+
+def iter_dataset(scale_factor=1, seed=0, num_workers=None, chunk_size=SHARD_SIZE, tables=None, **kwargs):
+    # Yields (table, chunk) pairs table by table, parents first
+    sizes = table_sizes(scale_factor)
+    for table in tables or TABLE_ORDER:
+        table_kwargs = _table_kwargs(table, sizes, kwargs)
+        for chunk in iter_table_chunks(table, sizes[table], seed, num_workers, chunk_size, **table_kwargs):
+            yield table, chunk
+
+
+def build_dataset(scale_factor=1, seed=0, num_workers=None, shard_size=SHARD_SIZE, tables=None, **kwargs):
+    sizes = table_sizes(scale_factor)
+    dataset = {}
+    for table in tables or TABLE_ORDER:
+        table_kwargs = _table_kwargs(table, sizes, kwargs)
+        columns = generate_table_sharded(table, sizes[table], seed, num_workers, shard_size, **table_kwargs)
+        dataset[table] = pd.DataFrame(columns)
+    return dataset
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module is the one place where the connection to the dtsc_vehicles MySQL database is configured. Every stage
+# borrows its connections from a shared pool, so the connection handshake only happens once per pooled connection.
+#
+#    Connection Settings: host, user, password, database and pool size, each overridable with an environment variable
+#    (DTSC_DB_HOST, DTSC_DB_USER, DTSC_DB_PASSWORD, DTSC_DB_NAME, DTSC_DB_POOL_SIZE).
+#
+#    The Pool: get_pool() creates the pool once (thread-safe) and get_connection() borrows a connection, waiting for one
+#    to be returned when all of them are in use. close() on a borrowed connection hands it back to the pool.
+#
+#    Context Manager: "with pooled_connection() as conn:" borrows a connection and always returns it.
+#
+#    Loading Connections: allow_local_infile is only switched on in a second pool, used by the bulk loaders through
+#    loading_connection(), so the connections of every other stage cannot be asked to send client files.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector.pooling
+from mysql.connector.errors import PoolError
+
+
+# 2. Connection settings
+# ---------------------------------------------------------------------------------------------------------------------------
+
+DB_CONFIG = {
+    'host': os.environ.get('DTSC_DB_HOST', 'localhost'),
+    'user': os.environ.get('DTSC_DB_USER', 'paul_walker'),
+    'password': os.environ.get('DTSC_DB_PASSWORD', 'dtsc691root'),
+    'database': os.environ.get('DTSC_DB_NAME', 'dtsc_vehicles'),
+}
+
+# Only for the connections that run LOAD DATA LOCAL INFILE in bulk_loader.py
+LOCAL_INFILE_CONFIG = dict(DB_CONFIG, allow_local_infile=True)
+
+POOL_NAME = 'dtsc_vehicles_pool'
+POOL_SIZE = int(os.environ.get('DTSC_DB_POOL_SIZE', 8))   # mysql.connector allows at most 32
+POOL_WAIT_SECONDS = 30
+
+
+# 3. The pool
+# ---------------------------------------------------------------------------------------------------------------------------
+
+# One pool for ordinary connections and one for loading connections (local_infile=True)
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def get_pool(pool_size=None, local_infile=False):
+    # pool_size only matters for the call that creates the pool
+    with _pool_lock:
+        if local_infile not in _pools:
+            _pools[local_infile] = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=POOL_NAME + ('_local_infile' if local_infile else ''), pool_size=pool_size or POOL_SIZE,
+                pool_reset_session=True, **(LOCAL_INFILE_CONFIG if local_infile else DB_CONFIG))
+    return _pools[local_infile]
+
+
+def get_connection(timeout=POOL_WAIT_SECONDS, local_infile=False):
+    pool = get_pool(local_infile=local_infile)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return pool.get_connection()
+        except PoolError:
+            # Every pooled connection is borrowed; wait for another stage or thread to return one
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+# 4. Context manager
+# ---------------------------------------------------------------------------------------------------------------------------
+
+@contextmanager
+def pooled_connection(timeout=POOL_WAIT_SECONDS, local_infile=False):
+    conn = get_connection(timeout, local_infile)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+# 5. Loading connections
+# ---------------------------------------------------------------------------------------------------------------------------
+
+@contextmanager
+def loading_connection(timeout=POOL_WAIT_SECONDS):
+    # For the loaders that hand their connection to bulk_loader.bulk_load_table()
+    with pooled_connection(timeout, local_infile=True) as conn:
+        yield conn
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
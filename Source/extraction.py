@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module reads tables out of the database as typed chunks from server-side cursors, and several tables at once.
+#
+#    Declared Column Types: each table's column types follow its CREATE TABLE statement in Table_Creation.sql:
+#       INT          - int64, or pandas' nullable Int64 when the column holds NULLs (int64 would turn them into floats)
+#       DECIMAL      - float64 instead of decimal.Decimal objects
+#       DATE         - datetime64[ns] instead of datetime.date objects
+#       VARCHAR/TEXT - left to pandas, as read_sql_query does
+#    Columns can be overridden per call with dtypes={...}.
+#
+#    Streaming Cursors: mysql.connector cursors are unbuffered (server-side) unless buffered=True is asked for, so rows
+#    stay on the server until fetchmany() asks for them. A stream that is stopped early discards the rest of its result.
+#
+#    Extracting: iter_table() yields typed chunks, optionally with a per-chunk function (a cleaning step) applied to
+#    each. extract_table() collects them into one DataFrame, so the whole result still ends up in memory; it saves the
+#    driver's list of row tuples and any rows a where clause or transform drops.
+#
+#    Concurrent Extraction: extract_tables() reads several tables at once, each on its own pooled connection in a thread
+#    of its own, so the extraction takes about as long as the largest table.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from schema import base_table_name, load_order, load_schema
+
+
+EXTRACT_CHUNK_ROWS = 50000
+
+
+# 2. Declared column types
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def sql_type_to_dtype(sql_type):
+    base_type = sql_type.split('(')[0].strip().upper()
+    if base_type in ('INT', 'INTEGER', 'SMALLINT', 'BIGINT', 'TINYINT'):
+        return 'int64'
+    if base_type in ('DECIMAL', 'NUMERIC', 'FLOAT', 'DOUBLE', 'REAL'):
+        return 'float64'
+    if base_type in ('DATE', 'DATETIME', 'TIMESTAMP'):
+        return 'datetime64[ns]'
+    # Text columns keep the type pandas infers for them
+    return None
+
+
+def table_dtypes(table, schema=None):
+    schema = schema or load_schema()
+    dtypes = {column: sql_type_to_dtype(sql_type) for column, sql_type in schema[base_table_name(table)]['columns']}
+    return {column: dtype for column, dtype in dtypes.items() if dtype is not None}
+
+
+def apply_dtypes(frame, dtypes):
+    for column, dtype in dtypes.items():
+        if column not in frame.columns:
+            continue
+        if dtype.startswith('datetime64'):
+            frame[column] = pd.to_datetime(frame[column]).astype(dtype)
+        elif dtype == 'float64':
+            # MySQL returns DECIMAL values as decimal.Decimal objects
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').astype(np.float64)
+        elif dtype == 'int64' and frame[column].isna().any():
+            # Chunks with and without NULLs concatenate to Int64
+            frame[column] = frame[column].astype('Int64')
+        else:
+            frame[column] = frame[column].astype(dtype)
+    return frame
+
+
+# 3. Streaming cursors
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _streaming_cursor(conn):
+    try:
+        return conn.cursor(buffered=False)
+    except TypeError:
+        # DB-API drivers without the option (sqlite3, duckdb) already step through results lazily
+        return conn.cursor()
+
+
+def iter_query(conn, query, params=None, chunk_size=EXTRACT_CHUNK_ROWS, dtypes=None):
+    cursor = _streaming_cursor(conn)
+    try:
+        cursor.execute(query, params or ())
+        columns = [description[0] for description in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield apply_dtypes(pd.DataFrame.from_records(rows, columns=columns), dtypes or {})
+    finally:
+        if getattr(conn, 'unread_result', False):
+            conn.consume_results()
+        cursor.close()
+
+
+# 4. Extracting
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def select_query(table, columns=None, where=None):
+    query = f"SELECT {', '.join(columns) if columns else '*'} FROM {table}"
+    return query + f" WHERE {where}" if where else query
+
+
+def iter_table(conn, table, chunk_size=EXTRACT_CHUNK_ROWS, columns=None, where=None, params=None, dtypes=None,
+               transform=None):
+    declared = dict(table_dtypes(table), **(dtypes or {}))
+    for chunk in iter_query(conn, select_query(table, columns, where), params, chunk_size, declared):
+        yield transform(chunk) if transform else chunk
+
+
+def extract_table(conn, table, chunk_size=EXTRACT_CHUNK_ROWS, **kwargs):
+    chunks = list(iter_table(conn, table, chunk_size, **kwargs))
+    if not chunks:
+        # An empty result still comes back with the declared columns and types
+        columns = kwargs.get('columns') or [column for column, _ in load_schema()[base_table_name(table)]['columns']]
+        empty = pd.DataFrame({column: pd.Series(dtype='object') for column in columns})
+        return apply_dtypes(empty, dict(table_dtypes(table), **(kwargs.get('dtypes') or {})))
+    return pd.concat(chunks, ignore_index=True)
+
+
+# 5. Concurrent extraction
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _extract_with(connect, table, chunk_size, kwargs):
+    with connect() as conn:
+        return extract_table(conn, table, chunk_size, **kwargs)
+
+
+def extract_tables(tables=None, connect=None, max_workers=8, chunk_size=EXTRACT_CHUNK_ROWS, table_kwargs=None):
+    # table_kwargs: table -> keyword arguments for extract_table() (columns, where, params, dtypes, transform)
+    if connect is None:
+        from db_connection import pooled_connection as connect
+    tables = list(tables or load_order())
+    table_kwargs = table_kwargs or {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tables))) as executor:
+        futures = {table: executor.submit(_extract_with, connect, table, chunk_size, table_kwargs.get(table, {}))
+                   for table in tables}
+        frames = {table: future.result() for table, future in futures.items()}
+    print(f"Extracted {len(frames)} tables ({sum(len(frame) for frame in frames.values()):,} rows) "
+          f"in {time.perf_counter() - start:.2f}s")
+    return frames
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module adds a fast-load mode for large loads: foreign key and unique checks are switched off for the loading
+# sessions, secondary indexes are built once at the end, and the foreign keys are verified afterwards with one
+# set-based query each.
+#
+#    Secondary Indexes: SECONDARY_INDEXES lists the indexes used by the cleaning and analysis queries (make/model
+#    lookups and date ranges). They are dropped before the load when they exist and created afterwards with one ALTER
+#    TABLE per table. The indexes MySQL creates for the foreign key columns are left alone.
+#
+#    Loading Sessions: fast_load_table() sets foreign_key_checks=0 and unique_checks=0 on its connection, loads the
+#    table, and restores both settings before the connection goes back to the pool.
+#
+#    Integrity Verification: for each foreign key, a LEFT JOIN counts the child rows whose key has no parent row.
+#
+#    Fast Loading a Dataset: fast_load_dataset() runs the steps above around the parallel loader (or a sequential load).
+#    With the checks off, all tables are loaded at the same time instead of parents first.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import time
+
+from bulk_loader import bulk_load_table
+from db_connection import loading_connection
+from parallel_loader import load_tables_parallel
+from schema import load_order, load_schema
+
+
+# 2. Secondary indexes
+# ---------------------------------------------------------------------------------------------------------------------------
+
+SECONDARY_INDEXES = {
+    'Cars': [('idx_cars_make_model', ['Make', 'Model'])],
+    'OwnershipHistory': [('idx_ownership_purchase_date', ['PurchaseDate']), ('idx_ownership_sale_date', ['SaleDate'])],
+    'Incidents': [('idx_incidents_date', ['IncidentDate'])],
+    'ServiceHistory': [('idx_service_date', ['ServiceDate'])],
+    'MarketTrends': [('idx_market_trends_date', ['Date'])],
+}
+
+
+def existing_indexes(conn, table):
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+                       "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,))
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def drop_secondary_indexes(conn, tables):
+    cursor = conn.cursor()
+    try:
+        for table in tables:
+            present = existing_indexes(conn, table)
+            drops = [f"DROP INDEX {name}" for name, _ in SECONDARY_INDEXES.get(table, []) if name in present]
+            if drops:
+                cursor.execute(f"ALTER TABLE {table} {', '.join(drops)}")
+    finally:
+        cursor.close()
+
+
+def build_secondary_indexes(conn, tables):
+    # One ALTER TABLE per table builds all of its indexes in a single pass over the data
+    cursor = conn.cursor()
+    try:
+        for table in tables:
+            present = existing_indexes(conn, table)
+            adds = [f"ADD INDEX {name} ({', '.join(columns)})"
+                    for name, columns in SECONDARY_INDEXES.get(table, []) if name not in present]
+            if adds:
+                start = time.perf_counter()
+                cursor.execute(f"ALTER TABLE {table} {', '.join(adds)}")
+                print(f"{table}: built {len(adds)} secondary index(es) in {time.perf_counter() - start:.2f}s")
+    finally:
+        cursor.close()
+
+
+# 3. Loading sessions
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _set_checks(conn, enabled):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SET SESSION foreign_key_checks = {int(enabled)}, unique_checks = {int(enabled)}")
+    finally:
+        cursor.close()
+
+
+def fast_load_table(conn, table, data, load_table=bulk_load_table, **kwargs):
+    _set_checks(conn, False)
+    try:
+        return load_table(conn, table, data, **kwargs)
+    finally:
+        _set_checks(conn, True)
+
+
+# 4. Integrity verification
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def orphan_count_query(table, column, parent, parent_column):
+    return (f"SELECT COUNT(*) FROM {table} c LEFT JOIN {parent} p ON c.{column} = p.{parent_column} "
+            f"WHERE c.{column} IS NOT NULL AND p.{parent_column} IS NULL")
+
+
+def verify_foreign_keys(conn, tables=None, schema=None):
+    schema = schema or load_schema()
+    violations = []
+    cursor = conn.cursor()
+    try:
+        for table in tables or list(schema):
+            for column, parent, parent_column in schema[table]['foreign_keys']:
+                cursor.execute(orphan_count_query(table, column, parent, parent_column))
+                orphans = cursor.fetchone()[0]
+                if orphans:
+                    violations.append({'table': table, 'column': column, 'references': f"{parent}({parent_column})",
+                                       'orphan_rows': orphans})
+                    print(f"{table}.{column}: {orphans:,} rows reference a missing {parent}.{parent_column}")
+    finally:
+        cursor.close()
+    if not violations:
+        print("All foreign keys verified: no orphan rows.")
+    return violations
+
+
+# 5. Fast loading a dataset
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def fast_load_dataset(dataset, parallel=True, connect=loading_connection, verify=True, **kwargs):
+    # dataset: table name -> data, e.g. from dataset_builder.build_dataset()
+    tables = [table for table in load_order() if table in dataset]
+    with connect() as conn:
+        drop_secondary_indexes(conn, tables)
+    if parallel:
+        # With the checks off nothing has to wait for its parents, so every table is submitted at once and the foreign
+        # keys are verified afterwards
+        unordered = {table: dict(info, foreign_keys=[]) for table, info in load_schema().items()}
+        reports = load_tables_parallel(dataset, load_table=fast_load_table, connect=connect, schema=unordered, **kwargs)
+    else:
+        with connect() as conn:
+            reports = [fast_load_table(conn, table, dataset[table], **kwargs) for table in tables]
+    with connect() as conn:
+        build_secondary_indexes(conn, tables)
+        violations = verify_foreign_keys(conn, tables) if verify else []
+    return {'tables': reports, 'violations': violations}
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module streams the eight generated tables into partitioned files (compressed CSV or Parquet) without MySQL, for
+# bulk tools such as LOAD DATA, COPY, DuckDB or Spark to load later.
+#
+#    File Formats: gzip-compressed CSV (default), plain CSV, or Parquet when pyarrow is installed.
+#
+#    Writing the Dataset: every generated chunk becomes one part file, <output_dir>/<Table>/part-00000.<ext>, so memory
+#    stays constant at any scale factor. _manifest.json lists the files and row counts of every table.
+#
+#    Command Line: python file_sinks.py <output_dir> --scale-factor SF10 --format parquet --workers 8 --skew CarID=1.1
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from dataset_builder import TABLE_ORDER, iter_dataset, parse_scale_factor
+from sharded_generation import SHARD_SIZE
+
+
+# 2. File formats
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _write_csv_gz(frame, path):
+    # Level 1 compresses several times faster than the default level 9 for a modest size increase
+    frame.to_csv(path, index=False, compression={'method': 'gzip', 'compresslevel': 1})
+
+
+def _write_csv(frame, path):
+    frame.to_csv(path, index=False)
+
+
+def _write_parquet(frame, path):
+    try:
+        frame.to_parquet(path, index=False)
+    except ImportError as e:
+        raise ImportError("Writing Parquet files requires pyarrow: pip install pyarrow") from e
+
+
+# File format (also the file extension) -> function writing one part file
+FILE_FORMATS = {
+    'csv.gz': _write_csv_gz,
+    'csv': _write_csv,
+    'parquet': _write_parquet,
+}
+
+
+# 3. Writing the dataset
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def write_dataset(output_dir, scale_factor=1, file_format='csv.gz', seed=0, num_workers=None, chunk_size=SHARD_SIZE,
+                  tables=None, **kwargs):
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Unknown file format '{file_format}', expected one of {list(FILE_FORMATS)}")
+    manifest = {
+        'scale_factor': parse_scale_factor(scale_factor),
+        'seed': seed,
+        'format': file_format,
+        'tables': {table: {'rows': 0, 'files': []} for table in tables or TABLE_ORDER},
+    }
+    for table, chunk in iter_dataset(scale_factor, seed, num_workers, chunk_size, tables, **kwargs):
+        table_dir = os.path.join(output_dir, table)
+        os.makedirs(table_dir, exist_ok=True)
+        entry = manifest['tables'][table]
+        file_name = f"part-{len(entry['files']):05d}.{file_format}"
+        frame = pd.DataFrame(chunk)
+        FILE_FORMATS[file_format](frame, os.path.join(table_dir, file_name))
+        entry['files'].append(os.path.join(table, file_name))
+        entry['rows'] += len(frame)
+        print(f"{table}: wrote {file_name} ({len(frame):,} rows)")
+    with open(os.path.join(output_dir, '_manifest.json'), 'w') as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+def read_table_files(output_dir, table):
+    # Reads all part files of one table back into a single DataFrame
+    with open(os.path.join(output_dir, '_manifest.json')) as file:
+        manifest = json.load(file)
+    paths = [os.path.join(output_dir, path) for path in manifest['tables'][table]['files']]
+    if manifest['format'] == 'parquet':
+        return pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+    return pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+
+
+# 4. Command line
+# ---------------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate the eight vehicle tables straight to partitioned files.')
+    parser.add_argument('output_dir')
+    parser.add_argument('--scale-factor', default='SF1')
+    parser.add_argument('--format', default='csv.gz', choices=list(FILE_FORMATS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=SHARD_SIZE)
+    parser.add_argument('--skew', nargs='*', default=[], metavar='COLUMN=EXPONENT',
+                        help='Zipf skew for CarID, OwnerID, Make or Model, e.g. --skew CarID=1.1 Make=1.2')
+    args = parser.parse_args()
+    skew = {column: float(exponent) for column, exponent in (item.split('=', 1) for item in args.skew)}
+    write_dataset(args.output_dir, args.scale_factor, args.format, args.seed, args.workers, args.chunk_size,
+                  skew=skew or None)
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This script measures how fast the data generating functions run. For each table it times the original per-row
+# generate_*_data() functions from "Database Data Insertion.py" and the vectorized generate_*_columns() functions at
+# several row counts, and records rows per second and peak memory.
+#
+#    Loading the Original Generators: "Database Data Insertion.py" connects to MySQL as soon as it runs, so only its
+#    import statements and function definitions are compiled (without mysql.connector and the modules using it).
+#
+#    Timing: each function is timed with time.perf_counter() on an untraced run, and its peak memory is read from
+#    tracemalloc, which also tracks NumPy allocations, on a second run.
+#
+#    Saving and Comparing Results: every result is appended as one JSON line (with the git commit, timestamp and library
+#    versions) to Benchmarks/generation_benchmarks.jsonl, and compare_runs() lines the latest run up against the
+#    previous one.
+#
+#    Command Line: python generation_benchmark.py --rows 1000 10000 100000 --legacy-max-rows 10000
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import argparse
+import ast
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+
+from vectorized_generation import GENERATORS
+
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+INSERTION_SCRIPT = os.path.join(SOURCE_DIR, 'Database Data Insertion.py')
+RESULTS_PATH = os.path.join(SOURCE_DIR, '..', 'Benchmarks', 'generation_benchmarks.jsonl')
+DEFAULT_ROW_COUNTS = (1000, 10000, 100000)
+
+# Modules the insertion script imports that need mysql.connector
+DATABASE_MODULES = ('db_connection', 'bulk_loader')
+
+# Table name to the original function name in "Database Data Insertion.py"
+LEGACY_FUNCTIONS = {
+    'Cars': 'generate_cars_data',
+    'Owners': 'generate_owners_data',
+    'OwnershipHistory': 'generate_ownership_history_data',
+    'VehicleCondition': 'generate_vehicle_condition_data',
+    'Features': 'generate_features_data',
+    'Incidents': 'generate_incidents_data',
+    'ServiceHistory': 'generate_service_history_data',
+    'MarketTrends': 'generate_market_trends_data',
+}
+
+
+# 2. Loading the original generators
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def load_legacy_generators(path=INSERTION_SCRIPT):
+    with open(path) as file:
+        tree = ast.parse(file.read(), filename=path)
+    keep = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = [alias.name for alias in node.names]
+            module = getattr(node, 'module', None) or ''
+            if module in DATABASE_MODULES or 'mysql' in module or any(name.startswith('mysql') for name in names):
+                continue
+            keep.append(node)
+        elif isinstance(node, ast.FunctionDef):
+            keep.append(node)
+    namespace = {}
+    exec(compile(ast.Module(body=keep, type_ignores=[]), path, 'exec'), namespace)
+    return {table: namespace[name] for table, name in LEGACY_FUNCTIONS.items() if name in namespace}
+
+
+# 3. Timing
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def time_generator(function, num_records):
+    # tracemalloc slows allocation-heavy code several times over, so the timed run and the memory run are separate
+    start = time.perf_counter()
+    function(num_records)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        function(num_records)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def run_benchmarks(row_counts=DEFAULT_ROW_COUNTS, tables=None, legacy_max_rows=10000, include_legacy=True, seed=0):
+    implementations = {'vectorized': {table: (lambda n, f=f: f(n, rng=seed)) for table, f in GENERATORS.items()}}
+    if include_legacy:
+        try:
+            implementations['legacy'] = load_legacy_generators()
+        except ImportError as e:
+            print(f"Skipping the original generators: {e}")
+    # Builds the cached Faker pools once so the first timed run does not pay for it
+    for table in GENERATORS:
+        GENERATORS[table](1, rng=seed)
+
+    results = []
+    for implementation, functions in implementations.items():
+        for table in tables or list(GENERATORS):
+            for num_records in row_counts:
+                if implementation == 'legacy' and num_records > legacy_max_rows:
+                    continue
+                seconds, peak = time_generator(functions[table], num_records)
+                result = {
+                    'implementation': implementation,
+                    'table': table,
+                    'rows': num_records,
+                    'seconds': round(seconds, 6),
+                    'rows_per_sec': round(num_records / seconds, 1) if seconds > 0 else None,
+                    'peak_memory_bytes': peak,
+                }
+                print(f"{implementation:>10} {table:<17} {num_records:>10,} rows  {result['rows_per_sec'] or 0:>14,.0f} rows/s  "
+                      f"{peak / 2 ** 20:>9.1f} MiB peak")
+                results.append(result)
+    return results
+
+
+# 4. Saving and comparing results
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SOURCE_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results, path=RESULTS_PATH):
+    run = {
+        'run_at': datetime.datetime.now().isoformat(timespec='milliseconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a') as file:
+        for result in results:
+            file.write(json.dumps(dict(run, **result)) + '\n')
+
+
+def compare_runs(path=RESULTS_PATH):
+    # Rows/sec of the latest run against the run before it, per implementation, table and row count
+    with open(path) as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    runs = sorted({record['run_at'] for record in records})
+    if len(runs) < 2:
+        return []
+    previous = {(r['implementation'], r['table'], r['rows']): r for r in records if r['run_at'] == runs[-2]}
+    comparison = []
+    for record in records:
+        key = (record['implementation'], record['table'], record['rows'])
+        if record['run_at'] != runs[-1] or key not in previous or not previous[key]['rows_per_sec']:
+            continue
+        change = record['rows_per_sec'] / previous[key]['rows_per_sec'] - 1
+        comparison.append(dict(zip(('implementation', 'table', 'rows'), key), change=round(change, 4)))
+    return comparison
+
+
+# 5. Command line
+# ---------------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the data generating functions.')
+    parser.add_argument('--rows', type=int, nargs='+', default=list(DEFAULT_ROW_COUNTS))
+    parser.add_argument('--tables', nargs='+', default=None, choices=list(GENERATORS))
+    parser.add_argument('--legacy-max-rows', type=int, default=10000)
+    parser.add_argument('--no-legacy', action='store_true')
+    parser.add_argument('--output', default=RESULTS_PATH)
+    args = parser.parse_args()
+
+    benchmark_results = run_benchmarks(args.rows, args.tables, args.legacy_max_rows, not args.no_legacy)
+    save_results(benchmark_results, args.output)
+    for row in compare_runs(args.output):
+        print(f"{row['implementation']:>10} {row['table']:<17} {row['rows']:>10,} rows  {row['change']:+.1%} vs previous run")
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
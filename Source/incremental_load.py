@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module makes loading idempotent: each incoming row is hashed, the hash is compared with the one stored by the
+# previous load, and only new or changed rows are upserted.
+#
+#    Row Hashes: rows are hashed with pandas' hash_pandas_object() on their text form, so the same values give the same
+#    hash whether a column arrives as int, float or string. The hashes live in a RowHashes table keyed by (TableName,
+#    RowID).
+#
+#    Upserting: new and changed rows are written in batches with INSERT ... ON DUPLICATE KEY UPDATE (MySQL) or INSERT ...
+#    ON CONFLICT DO UPDATE (SQLite, DuckDB), each batch updating its row hashes in the same transaction. Rows loaded
+#    earlier without a hash count as new. clear_row_hashes() forgets the hashes of tables that were reloaded some other
+#    way, as staging_swap.py does after every swap.
+#
+#    DuckDB runs ON CONFLICT DO UPDATE as a delete and insert, which foreign keys reject, so on DuckDB the tables other
+#    tables reference (Cars, Owners) only take new rows: an upsert that would change existing rows is refused.
+#
+#    Command Line: python incremental_load.py --backend sqlite --scale-factor SF1 --seed 1
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bulk_loader import to_frame
+from schema import dependencies, load_order, load_schema
+from storage_backends import BACKENDS, get_backend
+
+
+UPSERT_BATCH_ROWS = 5000
+ROW_HASH_TABLE = 'RowHashes'
+ROW_HASH_DDL = (f"CREATE TABLE IF NOT EXISTS {ROW_HASH_TABLE} (TableName VARCHAR(64), RowID INT, RowHash BIGINT, "
+                f"PRIMARY KEY (TableName, RowID))")
+
+
+# 2. Row hashes
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def row_hashes(frame):
+    # 64-bit hashes viewed as signed integers, which every backend's BIGINT can store
+    return pd.util.hash_pandas_object(frame.astype(str), index=False).to_numpy().view(np.int64)
+
+
+def stored_hashes(conn, backend, table):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT RowID, RowHash FROM {ROW_HASH_TABLE} WHERE TableName = {backend.placeholder}", (table,))
+        return pd.Series({row_id: row_hash for row_id, row_hash in cursor.fetchall()}, dtype=np.int64)
+    finally:
+        cursor.close()
+
+
+def changed_rows(frame, key_column, previous):
+    # Boolean masks of the rows that are new and the rows whose hash differs from the stored one
+    hashes = row_hashes(frame)
+    old = previous.reindex(frame[key_column].to_numpy()).to_numpy()
+    is_new = np.isnan(old) if old.dtype.kind == 'f' else np.zeros(len(frame), dtype=bool)
+    is_changed = ~is_new & (old != hashes)
+    return hashes, is_new, is_changed
+
+
+# 3. Upserting
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _row_count(conn, table):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def _check_parent_upsert(conn, backend, table, schema, previous, is_new, is_changed):
+    # Backends that cannot update rows other tables reference can still add rows to such a table, but not overwrite
+    # changed rows or rows that were loaded without a stored hash
+    if backend.supports_parent_upsert or not any(table in parents for parents in dependencies(schema).values()):
+        return
+    if is_changed.any() or (is_new.any() and _row_count(conn, table) > len(previous)):
+        raise ValueError(f"The {backend.name} backend cannot update rows of {table} while other tables reference it by "
+                         f"foreign key; recreate the tables with create_tables() and load them again instead")
+
+
+def upsert_table(backend, table, data, batch_rows=UPSERT_BATCH_ROWS, schema=None):
+    schema = schema or load_schema()
+    frame = to_frame(table, data)
+    columns = list(frame.columns)
+    key_columns = schema[table]['primary_key']
+    start = time.perf_counter()
+    with backend.connect() as conn:
+        previous = stored_hashes(conn, backend, table)
+        hashes, is_new, is_changed = changed_rows(frame, key_columns[0], previous)
+        _check_parent_upsert(conn, backend, table, schema, previous, is_new, is_changed)
+        write = is_new | is_changed
+        pending = frame[write]
+        pending_hashes = hashes[write]
+        data_query = backend.upsert_query(table, columns, key_columns)
+        hash_query = backend.upsert_query(ROW_HASH_TABLE, ['TableName', 'RowID', 'RowHash'], ['TableName', 'RowID'])
+        cursor = conn.cursor()
+        in_transaction = False
+        try:
+            for batch_start in range(0, len(pending), batch_rows):
+                batch = pending.iloc[batch_start:batch_start + batch_rows]
+                batch_hashes = pending_hashes[batch_start:batch_start + batch_rows]
+                # An explicit transaction on the cursor itself, since DuckDB cursors autocommit every statement
+                cursor.execute('BEGIN')
+                in_transaction = True
+                cursor.executemany(data_query, backend.prepare_rows(batch))
+                cursor.executemany(hash_query, [(table, int(row_id), int(row_hash)) for row_id, row_hash
+                                                in zip(batch[key_columns[0]], batch_hashes)])
+                cursor.execute('COMMIT')
+                in_transaction = False
+        except Exception:
+            if in_transaction:
+                cursor.execute('ROLLBACK')
+            raise
+        finally:
+            cursor.close()
+    seconds = time.perf_counter() - start
+    report = {
+        'table': table,
+        'rows': len(frame),
+        'new': int(is_new.sum()),
+        'changed': int(is_changed.sum()),
+        'unchanged': int(len(frame) - write.sum()),
+        'seconds': round(seconds, 4),
+    }
+    print(f"{table}: {report['new']:,} new, {report['changed']:,} changed, {report['unchanged']:,} unchanged "
+          f"in {seconds:.2f}s")
+    return report
+
+
+def clear_row_hashes(backend, tables):
+    # For tables whose rows were replaced without upsert_table() (e.g. by a staging swap): their stored hashes describe rows
+    # that are gone, so they are dropped and the next upsert writes every row once
+    if ROW_HASH_TABLE not in backend.table_names():
+        return
+    backend.execute(f"DELETE FROM {ROW_HASH_TABLE} WHERE TableName IN ({', '.join([backend.placeholder] * len(tables))})",
+                    tuple(tables))
+
+
+def upsert_dataset(backend, dataset, batch_rows=UPSERT_BATCH_ROWS):
+    # Parents first, so the new rows a child references are already in place
+    backend.execute(ROW_HASH_DDL)
+    return [upsert_table(backend, table, dataset[table], batch_rows) for table in load_order() if table in dataset]
+
+
+# 4. Command line
+# ---------------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    from dataset_builder import build_dataset
+
+    parser = argparse.ArgumentParser(description='Incrementally load a generated dataset, writing only new or changed rows.')
+    parser.add_argument('--backend', default=None, choices=list(BACKENDS))
+    parser.add_argument('--scale-factor', default='SF1')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-rows', type=int, default=UPSERT_BATCH_ROWS)
+    args = parser.parse_args()
+
+    upsert_dataset(get_backend(args.backend), build_dataset(args.scale_factor, args.seed, args.workers), args.batch_rows)
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module records every batch the loaders send, retries deadlocked batches and summarizes the results per table.
+#
+#    Recording Batches: LoadMetrics collects the rows, latency, bytes sent and retries of every batch, and is thread-safe
+#    so the parallel loader and the pipeline writers can share one instance. Bytes sent is the size of the staged file for
+#    LOAD DATA, and the size of the statement text plus the bound values for INSERTs.
+#
+#    Retries: run_with_retries() re-runs a batch after a deadlock (MySQL error 1213) or a lock wait timeout (1205), which
+#    roll the transaction back, with a growing pause between attempts. LOAD DATA, the multi-row INSERT transaction and
+#    each batch of insert_batched() in bulk_loader.py all go through it.
+#
+#    The Report: for each table: rows, batches, rows per second, p50/p90/p99/max batch latency, a latency histogram,
+#    bytes sent and retries. save_report() appends it as one JSON line to Benchmarks/load_metrics.jsonl.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import datetime
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+
+REPORT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Benchmarks', 'load_metrics.jsonl')
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket catches everything slower
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# MySQL lock wait timeout and deadlock errors
+RETRYABLE_ERRORS = (1205, 1213)
+MAX_RETRIES = 3
+
+
+# 2. Recording batches
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def payload_bytes(query, rows):
+    # Approximate bytes on the wire for an INSERT: the statement text plus the text form of every bound value
+    return len(query.encode()) + sum(len(str(value).encode()) for row in rows for value in row)
+
+
+class LoadMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tables = {}
+
+    def _table(self, table):
+        return self._tables.setdefault(table, {'rows': 0, 'latencies': [], 'bytes_sent': 0, 'retries': 0})
+
+    def record_batch(self, table, rows, seconds, bytes_sent=0):
+        with self._lock:
+            entry = self._table(table)
+            entry['rows'] += rows
+            entry['latencies'].append(seconds)
+            entry['bytes_sent'] += bytes_sent
+
+    def record_retry(self, table):
+        with self._lock:
+            self._table(table)['retries'] += 1
+
+    def table_report(self, table):
+        with self._lock:
+            entry = self._tables[table]
+            latencies_ms = np.array(entry['latencies']) * 1000
+            rows, bytes_sent, retries = entry['rows'], entry['bytes_sent'], entry['retries']
+        seconds = latencies_ms.sum() / 1000
+        counts = np.bincount(np.searchsorted(LATENCY_BUCKETS_MS, latencies_ms), minlength=len(LATENCY_BUCKETS_MS) + 1)
+        labels = [f'<={bound}ms' for bound in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]}ms']
+        p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99]) if len(latencies_ms) else (None, None, None)
+        return {
+            'table': table,
+            'rows': rows,
+            'batches': len(latencies_ms),
+            'seconds': round(seconds, 4),
+            'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else None,
+            'latency_ms': {
+                'p50': None if p50 is None else round(p50, 3),
+                'p90': None if p90 is None else round(p90, 3),
+                'p99': None if p99 is None else round(p99, 3),
+                'max': round(latencies_ms.max(), 3) if len(latencies_ms) else None,
+            },
+            'latency_histogram': {label: int(count) for label, count in zip(labels, counts) if count},
+            'bytes_sent': bytes_sent,
+            'retries': retries,
+        }
+
+    def report(self):
+        with self._lock:
+            tables = list(self._tables)
+        return [self.table_report(table) for table in tables]
+
+
+# 3. Retries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def run_with_retries(function, conn, table, metrics=None, max_retries=MAX_RETRIES):
+    # function() must run and commit one whole transaction, so that a rollback followed by a rerun repeats it exactly
+    for attempt in range(max_retries + 1):
+        try:
+            return function()
+        except Exception as e:
+            if getattr(e, 'errno', None) not in RETRYABLE_ERRORS or attempt == max_retries:
+                raise
+            conn.rollback()
+            if metrics is not None:
+                metrics.record_retry(table)
+            time.sleep(0.1 * 2 ** attempt)
+
+
+# 4. The report
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def print_report(report):
+    for entry in report:
+        latency = entry['latency_ms']
+        print(f"{entry['table']:<17} {entry['rows']:>12,} rows  {entry['rows_per_sec'] or 0:>12,.0f} rows/s  "
+              f"p50 {latency['p50'] or 0:>8.1f}ms  p99 {latency['p99'] or 0:>8.1f}ms  "
+              f"{entry['bytes_sent'] / 2 ** 20:>8.1f} MiB  {entry['retries']} retries")
+
+
+def save_report(report, path=REPORT_PATH, **run_info):
+    # One JSON line per run, e.g. save_report(metrics.report(), batch_size=10000)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    run = dict(run_at=datetime.datetime.now().isoformat(timespec='milliseconds'), **run_info, tables=report)
+    with open(path, 'a') as file:
+        file.write(json.dumps(run) + '\n')
+    return run
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module overlaps data generation with insertion: a producer thread fills a bounded queue with generated chunks
+# while writer threads load them into MySQL.
+#
+#    Producer: chunks come from dataset_builder.iter_dataset(). The queue holds at most queue_size chunks, so put()
+#    blocks when the writers fall behind and memory stays bounded. Before the first chunk of a table is queued, the
+#    producer waits until every chunk of the tables it references has been written.
+#
+#    Writers: each writer thread borrows one loading connection for the whole run and loads chunks with
+#    bulk_load_table(), stopping at its stop marker.
+#
+#    Errors: the first error raised by the producer or any writer stops the pipeline, and it is raised from
+#    run_pipeline() once every thread has finished.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import queue
+import threading
+import time
+
+from bulk_loader import bulk_load_table
+from dataset_builder import iter_dataset
+from db_connection import loading_connection
+from schema import dependencies
+from sharded_generation import SHARD_SIZE
+
+
+_STOP = object()
+
+
+class _PipelineState:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.pending = {}       # table -> chunks queued but not yet written
+        self.rows = {}          # table -> rows written
+        self.errors = []
+        self.failed = threading.Event()
+
+    def fail(self, error):
+        with self.condition:
+            self.errors.append(error)
+            self.failed.set()
+            self.condition.notify_all()
+
+
+# 2. Producer
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _put(chunks, item, state):
+    # Blocks while the queue is full, but gives up as soon as a writer has failed
+    while not state.failed.is_set():
+        try:
+            chunks.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _wait_for_parents(table, parents, state):
+    with state.condition:
+        state.condition.wait_for(lambda: state.failed.is_set()
+                                 or all(state.pending.get(parent, 0) == 0 for parent in parents.get(table, ())))
+
+
+def _produce(chunks, state, num_writers, parents, generation_kwargs):
+    current_table = None
+    try:
+        for table, chunk in iter_dataset(**generation_kwargs):
+            if table != current_table:
+                _wait_for_parents(table, parents, state)
+                current_table = table
+            with state.condition:
+                state.pending[table] = state.pending.get(table, 0) + 1
+            if not _put(chunks, (table, chunk), state):
+                break
+    except Exception as e:
+        state.fail(e)
+    finally:
+        if state.failed.is_set():
+            # Queued chunks will not be written anyway. Only the producer queues stop markers, so none is lost here.
+            _drain(chunks)
+        # Every writer keeps taking items until its stop marker arrives, so these puts cannot block for good
+        for _ in range(num_writers):
+            chunks.put(_STOP)
+
+
+def _drain(chunks):
+    try:
+        while True:
+            chunks.get_nowait()
+    except queue.Empty:
+        pass
+
+
+# 3. Writers
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _write(chunks, state, connect, load_chunk, load_kwargs):
+    try:
+        with connect() as conn:
+            while True:
+                item = chunks.get()
+                if item is _STOP:
+                    return
+                if state.failed.is_set():
+                    continue
+                table, chunk = item
+                report = load_chunk(conn, table, chunk, **load_kwargs)
+                with state.condition:
+                    state.rows[table] = state.rows.get(table, 0) + report['rows']
+                    state.pending[table] -= 1
+                    state.condition.notify_all()
+    except Exception as e:
+        state.fail(e)
+        # Keep taking items until this writer's stop marker arrives so the producer never blocks on a full queue
+        while chunks.get() is not _STOP:
+            pass
+
+
+# 4. Running the pipeline
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def run_pipeline(scale_factor=1, seed=0, num_generators=None, num_writers=4, queue_size=8, chunk_size=SHARD_SIZE,
+                 tables=None, connect=loading_connection, load_chunk=bulk_load_table, load_kwargs=None, **kwargs):
+    chunks = queue.Queue(maxsize=queue_size)
+    state = _PipelineState()
+    parents = dependencies()
+    generation_kwargs = dict(scale_factor=scale_factor, seed=seed, num_workers=num_generators, chunk_size=chunk_size,
+                             tables=tables, **kwargs)
+
+    start = time.perf_counter()
+    writers = [threading.Thread(target=_write, args=(chunks, state, connect, load_chunk, load_kwargs or {}),
+                                name=f'writer-{i}') for i in range(num_writers)]
+    producer = threading.Thread(target=_produce, args=(chunks, state, num_writers, parents, generation_kwargs),
+                                name='producer')
+    for thread in writers + [producer]:
+        thread.start()
+    for thread in [producer] + writers:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    if state.errors:
+        raise state.errors[0]
+    total_rows = sum(state.rows.values())
+    print(f"Pipeline wrote {total_rows:,} rows in {seconds:.2f}s ({total_rows / seconds if seconds else 0:,.0f} rows/s)")
+    return {'rows': state.rows, 'seconds': round(seconds, 4)}
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
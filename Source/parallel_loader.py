@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module loads tables concurrently, each on its own connection, starting a table as soon as every table it
+# references is loaded.
+#
+#    Scheduling: the dependency DAG comes from SQL/Table_Creation.sql (schema.py). Once Cars is in, Owners and the five
+#    tables that only need Cars load at the same time, and OwnershipHistory starts when Owners is done. If a table fails,
+#    the tables depending on it are skipped and the error is raised after the running loads finish.
+#
+#    Connections: every load borrows its own connection from db_connection.loading_connection() (or from connect, e.g. a
+#    storage backend's), so no connection is shared between threads.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from bulk_loader import bulk_load_table
+from schema import dependencies
+
+
+# 2. Scheduling
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _load_one(connect, load_table, table, data, kwargs):
+    with connect() as conn:
+        return load_table(conn, table, data, **kwargs)
+
+
+def load_tables_parallel(dataset, load_table=bulk_load_table, max_workers=6, connect=None, schema=None, **kwargs):
+    # dataset: table name -> data accepted by load_table(conn, table, data, **kwargs)
+    if connect is None:
+        from db_connection import loading_connection as connect
+    parents = {table: deps & set(dataset) for table, deps in dependencies(schema).items() if table in dataset}
+    unknown = set(dataset) - set(parents)
+    if unknown:
+        raise ValueError(f"Tables not found in the schema: {sorted(unknown)}")
+
+    start = time.perf_counter()
+    reports, done, failed, errors = {}, set(), set(), []
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            for table in parents:
+                if table in done or table in failed or table in running.values():
+                    continue
+                if parents[table] & failed:
+                    failed.add(table)
+                    print(f"{table}: skipped because {sorted(parents[table] & failed)} failed to load")
+                elif parents[table] <= done:
+                    future = executor.submit(_load_one, connect, load_table, table, dataset[table], kwargs)
+                    running[future] = table
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                table = running.pop(future)
+                try:
+                    reports[table] = future.result()
+                    done.add(table)
+                except Exception as e:
+                    failed.add(table)
+                    errors.append((table, e))
+                    print(f"{table}: load failed ({e})")
+
+    seconds = time.perf_counter() - start
+    print(f"Loaded {len(done)} of {len(parents)} tables in {seconds:.2f}s wall clock")
+    if errors:
+        table, error = errors[0]
+        raise RuntimeError(f"Loading {table} failed; tables not loaded: {sorted(failed)}") from error
+    return [reports[table] for table in parents if table in reports]
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
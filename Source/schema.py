@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module parses SQL/Table_Creation.sql into the columns, primary key and foreign keys of every table and derives
+# the order the tables have to be loaded in.
+#
+#    Parsing Table_Creation.sql: each CREATE TABLE statement is split into its column and constraint lines. Both inline
+#    ("CarID INT PRIMARY KEY") and separate ("PRIMARY KEY (CarID)") primary keys are understood.
+#
+#    Dependency DAG: every table depends on the tables its foreign keys reference. load_levels() groups the tables into
+#    levels that only depend on earlier ones: Cars, then Owners with the five tables that only need Cars, then
+#    OwnershipHistory.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import os
+import re
+from functools import lru_cache
+
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'SQL', 'Table_Creation.sql')
+
+CREATE_TABLE_PATTERN = re.compile(r'CREATE\s+TABLE\s+(\w+)\s*\((.*?)\)\s*;', re.IGNORECASE | re.DOTALL)
+FOREIGN_KEY_PATTERN = re.compile(r'FOREIGN\s+KEY\s*\((\w+)\)\s*REFERENCES\s+(\w+)\s*\((\w+)\)', re.IGNORECASE)
+PRIMARY_KEY_PATTERN = re.compile(r'PRIMARY\s+KEY\s*\(([\w\s,]+)\)', re.IGNORECASE)
+
+# Shadow copies of a table (see staging_swap.py) are named <Table>__staging and have the same columns
+STAGING_SUFFIX = '__staging'
+
+
+# 2. Parsing Table_Creation.sql
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _split_definitions(body):
+    # Splits on commas that are not inside parentheses, so DECIMAL(10, 2) stays one definition
+    parts, depth, current = [], 0, ''
+    for character in body:
+        if character == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        depth += (character == '(') - (character == ')')
+        current += character
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def parse_schema(sql):
+    schema = {}
+    for match in CREATE_TABLE_PATTERN.finditer(sql):
+        table, body = match.group(1), match.group(2)
+        columns, primary_key, foreign_keys = [], [], []
+        for definition in _split_definitions(body):
+            foreign_key = FOREIGN_KEY_PATTERN.match(definition)
+            primary_key_clause = PRIMARY_KEY_PATTERN.match(definition)
+            if foreign_key:
+                foreign_keys.append(foreign_key.groups())
+            elif primary_key_clause:
+                primary_key.extend(name.strip() for name in primary_key_clause.group(1).split(','))
+            else:
+                name, column_type = definition.split(None, 1)
+                if re.search(r'\bPRIMARY\s+KEY\b', column_type, re.IGNORECASE):
+                    primary_key.append(name)
+                    column_type = re.sub(r'\s*\bPRIMARY\s+KEY\b', '', column_type, flags=re.IGNORECASE)
+                columns.append((name, column_type.strip()))
+        schema[table] = {
+            'columns': columns,
+            'primary_key': primary_key,
+            'foreign_keys': foreign_keys,   # (column, referenced table, referenced column)
+            'create_sql': match.group(0),
+        }
+    return schema
+
+
+@lru_cache(maxsize=None)
+def load_schema(path=SCHEMA_PATH):
+    with open(path) as file:
+        return parse_schema(file.read())
+
+
+def base_table_name(table):
+    return table[:-len(STAGING_SUFFIX)] if table.endswith(STAGING_SUFFIX) else table
+
+
+# 3. Dependency DAG
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def dependencies(schema=None):
+    # Table -> set of tables it references (self references do not block loading)
+    schema = schema or load_schema()
+    return {table: {parent for _, parent, _ in info['foreign_keys'] if parent != table and parent in schema}
+            for table, info in schema.items()}
+
+
+def load_levels(schema=None):
+    remaining = dependencies(schema)
+    levels, done = [], set()
+    while remaining:
+        level = [table for table, parents in remaining.items() if parents <= done]
+        if not level:
+            raise ValueError(f"Foreign keys form a cycle between {sorted(remaining)}")
+        levels.append(level)
+        done.update(level)
+        for table in level:
+            del remaining[table]
+    return levels
+
+
+def load_order(schema=None):
+    # Parents before children, in the order the tables appear in the SQL file within each level
+    return [table for level in load_levels(schema) for table in level]
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module runs the vectorized generating functions in shards across worker processes. Each shard has its own random
+# stream, so the output is reproducible and identical for any number of workers.
+#
+#    Shard Layout and Seeding: a table's ID range is cut into fixed-size shards, and each shard's random stream is derived
+#    from (seed, table, shard number) with numpy's SeedSequence.
+#
+#    Sharded Generation: shards run on a ProcessPoolExecutor and are either streamed back one chunk at a time in shard
+#    order (iter_table_chunks), which keeps peak memory constant, or concatenated into a whole table
+#    (generate_table_sharded).
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import datetime
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from value_pools import warm_pools
+from vectorized_generation import GENERATORS, TABLE_COLUMNS, columns_to_rows
+
+
+# 2. Shard layout and seeding
+# ---------------------------------------------------------------------------------------------------------------------------
+
+SHARD_SIZE = 250000
+
+# Tables drawn from the cached Faker value pools
+POOLED_TABLES = ('Owners',)
+
+# Tables whose rows are grouped by car (ownership chains). Their shards split the cars between them instead of all drawing
+# from every car, so a car's chain is never spread over two shards.
+CAR_PARTITIONED_TABLES = ('OwnershipHistory',)
+
+# Tables whose generating function accepts an end_date
+DATED_TABLES = ('OwnershipHistory', 'Incidents', 'ServiceHistory', 'MarketTrends')
+
+# Fixed table numbers used in the seed derivation, so every table draws from its own family of streams
+TABLE_KEYS = {table: number for number, table in enumerate(TABLE_COLUMNS)}
+
+
+def shard_bounds(num_records, shard_size=SHARD_SIZE):
+    # List of (shard_index, start_id, num_records) covering IDs 1..num_records
+    return [(index, start + 1, min(shard_size, num_records - start))
+            for index, start in enumerate(range(0, num_records, shard_size))]
+
+
+def shard_rng(seed, table, shard_index):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(TABLE_KEYS[table], shard_index)))
+
+
+# 3. Sharded generation
+# ---------------------------------------------------------------------------------------------------------------------------
+
+# Keyword arguments (including parent key arrays, which can be large) are sent to each worker process once through the pool
+# initializer rather than being pickled again for every shard.
+_worker_kwargs = {}
+
+
+def _init_worker(kwargs):
+    global _worker_kwargs
+    _worker_kwargs = kwargs
+
+
+def _generate_shard(table, seed, shard_index, num_shards, start_id, num_records, kwargs=None):
+    rng = shard_rng(seed, table, shard_index)
+    kwargs = _worker_kwargs if kwargs is None else kwargs
+    if table in CAR_PARTITIONED_TABLES and num_shards > 1:
+        kwargs = dict(kwargs, car_partition=(shard_index, num_shards))
+    return GENERATORS[table](num_records, rng=rng, start_id=start_id, **kwargs)
+
+
+def _concatenate(table, shards):
+    return {column: np.concatenate([shard[column] for shard in shards]) for column in TABLE_COLUMNS[table]}
+
+
+def _pin_end_date(table, kwargs):
+    # Every shard must agree on 'today', even if the run crosses midnight
+    kwargs = dict(kwargs)
+    if table in DATED_TABLES and kwargs.get('end_date') is None:
+        kwargs['end_date'] = datetime.date.today()
+    return kwargs
+
+
+def iter_table_chunks(table, num_records, seed=0, num_workers=1, chunk_size=SHARD_SIZE, **kwargs):
+    # Yields the table one shard at a time as a dictionary of column arrays. At most two chunks per worker are in flight,
+    # so peak memory depends on chunk_size and num_workers but not on num_records.
+    kwargs = _pin_end_date(table, kwargs)
+    bounds = shard_bounds(num_records, chunk_size)
+    if num_workers == 1 or len(bounds) <= 1:
+        for index, start_id, count in bounds:
+            yield _generate_shard(table, seed, index, len(bounds), start_id, count, kwargs)
+        return
+    num_workers = num_workers or os.cpu_count()
+    if table in POOLED_TABLES:
+        # Build missing pools once here rather than in every worker at the same time
+        warm_pools()
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker, initargs=(kwargs,)) as executor:
+        pending = deque()
+        for index, start_id, count in bounds:
+            pending.append(executor.submit(_generate_shard, table, seed, index, len(bounds), start_id, count))
+            if len(pending) >= 2 * num_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_row_batches(chunks):
+    # Adapts a chunk stream to lists of tuples for cursor.executemany()
+    for chunk in chunks:
+        yield columns_to_rows(chunk)
+
+
+def generate_table_sharded(table, num_records, seed=0, num_workers=None, shard_size=SHARD_SIZE, **kwargs):
+    shards = list(iter_table_chunks(table, num_records, seed, num_workers, shard_size, **kwargs))
+    if not shards:
+        return {column: np.array([]) for column in TABLE_COLUMNS[table]}
+    return _concatenate(table, shards)
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module reloads the eight tables without taking them away from readers: the new data is loaded into shadow tables
+# that are swapped into place in one step.
+#
+#    Staging Tables: every table gets a <Table>__staging copy created from its statement in Table_Creation.sql, with its
+#    foreign keys pointing at the other staging tables. The loaders write only to these.
+#
+#    The Swap: one RENAME TABLE statement (one transaction on SQLite) renames each live table to <Table>__old and each
+#    staging table to <Table>. Foreign keys follow the tables they reference through a rename, so readers see either the
+#    complete old data or the complete new data. The old tables are then dropped, children first, and the RowHashes
+#    entries of the swapped tables are cleared.
+#
+#    Reloading: reload_with_swap() runs the steps above for all tables together, since a child left behind would keep
+#    referencing its parent's __old copy. DuckDB cannot rename tables that foreign keys point at, so its backend is
+#    refused before anything is created.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import re
+import time
+
+from incremental_load import clear_row_hashes
+from parallel_loader import load_tables_parallel
+from schema import STAGING_SUFFIX, load_order, load_schema, parse_schema
+from storage_backends import get_backend
+
+
+OLD_SUFFIX = '__old'
+
+
+# 2. Staging tables
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def staging_name(table):
+    return table + STAGING_SUFFIX
+
+
+def staging_ddl(table, schema=None):
+    schema = schema or load_schema()
+    sql = re.sub(rf'(CREATE\s+TABLE\s+){table}\b', rf'\g<1>{staging_name(table)}', schema[table]['create_sql'],
+                 flags=re.IGNORECASE)
+    sql = re.sub(r'(REFERENCES\s+)(\w+)', lambda match: match.group(1) + staging_name(match.group(2)), sql,
+                 flags=re.IGNORECASE)
+    return sql.rstrip().rstrip(';')
+
+
+def create_staging_tables(backend, tables, schema=None):
+    schema = schema or load_schema()
+    order = [table for table in load_order(schema) if table in tables]
+    # Leftovers of an interrupted reload are dropped first, children before parents
+    existing = backend.table_names()
+    for table in reversed(order):
+        if staging_name(table) in existing:
+            backend.execute(f"DROP TABLE {staging_name(table)}")
+    for table in order:
+        backend.execute(staging_ddl(table, schema))
+    return parse_schema(';\n'.join(staging_ddl(table, schema) for table in order) + ';')
+
+
+# 3. The swap
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def swap_staging_tables(backend, tables, schema=None):
+    order = [table for table in load_order(schema) if table in tables]
+    existing = backend.table_names()
+    renames = [(table, table + OLD_SUFFIX) for table in order if table in existing]
+    renames += [(staging_name(table), table) for table in order]
+    start = time.perf_counter()
+    backend.rename_tables(renames)
+    print(f"Swapped {len(order)} staging tables into place in {time.perf_counter() - start:.3f}s")
+    # The stored row hashes of incremental_load.py describe the rows that were just swapped out
+    clear_row_hashes(backend, order)
+    for table in reversed(order):
+        if table in existing:
+            backend.execute(f"DROP TABLE {table + OLD_SUFFIX}")
+
+
+# 4. Reloading
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def reload_with_swap(dataset, backend=None, max_workers=6, **kwargs):
+    # dataset: table name -> data for every table in Table_Creation.sql
+    backend = backend or get_backend()
+    if not backend.supports_swap:
+        raise ValueError(f"The {backend.name} backend cannot rename or drop tables referenced by foreign keys, "
+                         f"so staging tables cannot be swapped in; reload with create_tables() instead")
+    schema = load_schema()
+    missing = set(schema) - set(dataset)
+    if missing:
+        raise ValueError(f"A swap replaces every table together; no data given for {sorted(missing)}")
+
+    staging_schema = create_staging_tables(backend, schema, schema)
+    staged = {staging_name(table): data for table, data in dataset.items() if table in schema}
+    if backend.parallel_writes:
+        reports = load_tables_parallel(staged, load_table=backend.load_table, max_workers=max_workers,
+                                       connect=backend.load_connect, schema=staging_schema, **kwargs)
+    else:
+        with backend.load_connect() as conn:
+            reports = [backend.load_table(conn, table, staged[table], **kwargs) for table in load_order(staging_schema)]
+    swap_staging_tables(backend, schema, schema)
+    return reports
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
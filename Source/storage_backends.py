@@ -0,0 +1,332 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module puts the insertion and extraction stages behind a storage backend interface. MySQL, SQLite and DuckDB
+# backends all run the CREATE TABLE statements of SQL/Table_Creation.sql, so the pipeline can also run without a MySQL
+# server. mysql-connector-python and duckdb are only imported by the backends that use them.
+#
+#    The Backend Interface: every backend provides connect() (a context manager yielding a connection), load_table(conn,
+#    table, data) with the same report as bulk_loader.bulk_load_table(), and read_table(table). Creating the tables,
+#    loading a dataset (through parallel_loader.py) and reading all tables back are shared.
+#
+#    Backends: MySQL, SQLite and DuckDB.
+#
+#    Choosing a Backend: get_backend('sqlite') or the DTSC_BACKEND environment variable (mysql by default).
+#
+#    Command Line: python storage_backends.py --backend sqlite --scale-factor SF1 creates the tables, generates and loads
+#    the dataset, reads it back and prints the timings.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import argparse
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from bulk_loader import bulk_load_table, frame_to_rows, to_frame
+from parallel_loader import load_tables_parallel
+from schema import load_order, load_schema
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data')
+SQLITE_PATH = os.environ.get('DTSC_SQLITE_PATH', os.path.join(DATA_DIR, 'dtsc_vehicles.sqlite'))
+DUCKDB_PATH = os.environ.get('DTSC_DUCKDB_PATH', os.path.join(DATA_DIR, 'dtsc_vehicles.duckdb'))
+
+
+# 2. The backend interface
+# ---------------------------------------------------------------------------------------------------------------------------
+
+class StorageBackend:
+    name = None
+    placeholder = '%s'
+    table_names_query = "SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema()"
+    # Embedded databases allow one writer at a time, so loading them in parallel only adds lock waits
+    parallel_writes = True
+    # Whether tables referenced by foreign keys can be renamed and dropped, as staging_swap.py does
+    supports_swap = True
+    # Whether existing rows of a table referenced by foreign keys can be updated in place, as incremental_load.py does
+    supports_parent_upsert = True
+
+    @contextmanager
+    def connect(self):
+        raise NotImplementedError
+
+    def load_connect(self):
+        # Connection for bulk loads, which may need more rights than reads and small writes
+        return self.connect()
+
+    def load_table(self, conn, table, data, **kwargs):
+        raise NotImplementedError
+
+    def execute(self, sql, params=None):
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params or ())
+                conn.commit()
+            finally:
+                cursor.close()
+
+    def create_tables(self, drop_existing=True, schema=None):
+        schema = schema or load_schema()
+        order = load_order(schema)
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            try:
+                if drop_existing:
+                    for table in reversed(order):
+                        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                for table in order:
+                    cursor.execute(schema[table]['create_sql'].rstrip().rstrip(';'))
+                conn.commit()
+            finally:
+                cursor.close()
+
+    def table_names(self):
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.table_names_query)
+                return {row[0] for row in cursor.fetchall()}
+            finally:
+                cursor.close()
+
+    def rename_tables(self, renames):
+        # All renames in one transaction, so readers see either every old table or every new one
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('BEGIN')
+                for old_name, new_name in renames:
+                    cursor.execute(f"ALTER TABLE {old_name} RENAME TO {new_name}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def insert_query(self, table, columns):
+        return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([self.placeholder] * len(columns))})"
+
+    def upsert_query(self, table, columns, key_columns):
+        # Standard ON CONFLICT form, understood by SQLite and DuckDB
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns if column not in key_columns)
+        return (f"{self.insert_query(table, columns)} ON CONFLICT ({', '.join(key_columns)}) "
+                f"DO UPDATE SET {updates}")
+
+    def prepare_rows(self, frame):
+        # Rows of Python values the driver can bind
+        return frame_to_rows(frame)
+
+    def read_table(self, table, columns=None):
+        with self.connect() as conn:
+            return pd.read_sql_query(f"SELECT {', '.join(columns) if columns else '*'} FROM {table}", conn)
+
+    def read_tables(self, tables=None):
+        return {table: self.read_table(table) for table in tables or load_order()}
+
+    def load_dataset(self, dataset, max_workers=6, **kwargs):
+        if self.parallel_writes:
+            return load_tables_parallel(dataset, load_table=self.load_table, max_workers=max_workers,
+                                        connect=self.load_connect, **kwargs)
+        with self.load_connect() as conn:
+            return [self.load_table(conn, table, dataset[table], **kwargs) for table in load_order() if table in dataset]
+
+    def _report(self, table, rows, method, seconds):
+        report = {
+            'table': table,
+            'rows': rows,
+            'method': method,
+            'seconds': round(seconds, 4),
+            'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else None,
+        }
+        print(f"{table}: {rows:,} rows via {method} in {seconds:.2f}s ({report['rows_per_sec'] or 0:,.0f} rows/s)")
+        return report
+
+
+# 3. Backends
+# ---------------------------------------------------------------------------------------------------------------------------
+
+class MySQLBackend(StorageBackend):
+    name = 'mysql'
+    table_names_query = "SELECT table_name FROM information_schema.tables WHERE table_schema = DATABASE()"
+
+    @contextmanager
+    def connect(self):
+        # Imported here so the embedded backends work without mysql-connector-python installed
+        from db_connection import pooled_connection
+        with pooled_connection() as conn:
+            yield conn
+
+    @contextmanager
+    def load_connect(self):
+        # LOAD DATA LOCAL INFILE is only allowed on the loading pool's connections
+        from db_connection import loading_connection
+        with loading_connection() as conn:
+            yield conn
+
+    def load_table(self, conn, table, data, **kwargs):
+        return bulk_load_table(conn, table, data, **kwargs)
+
+    def upsert_query(self, table, columns, key_columns):
+        updates = ', '.join(f"{column} = VALUES({column})" for column in columns if column not in key_columns)
+        return f"{self.insert_query(table, columns)} ON DUPLICATE KEY UPDATE {updates}"
+
+    def rename_tables(self, renames):
+        # MySQL DDL commits implicitly, but a single RENAME TABLE statement swaps all of its tables atomically
+        self.execute('RENAME TABLE ' + ', '.join(f"{old_name} TO {new_name}" for old_name, new_name in renames))
+
+
+class SQLiteBackend(StorageBackend):
+    name = 'sqlite'
+    placeholder = '?'
+    table_names_query = "SELECT name FROM sqlite_master WHERE type = 'table'"
+    parallel_writes = False
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        self._keep_alive = None
+        if path == ':memory:':
+            # Every connection to a plain :memory: database is a new empty database; a named shared-cache one is shared
+            # for as long as at least one connection to it stays open
+            self.path = f'file:dtsc_vehicles_{id(self)}?mode=memory&cache=shared'
+            self._keep_alive = self._open()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, uri=self.path.startswith('file:'), timeout=60, check_same_thread=False)
+        conn.execute('PRAGMA foreign_keys = ON')
+        return conn
+
+    @contextmanager
+    def connect(self):
+        conn = self._open()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def prepare_rows(self, frame):
+        # sqlite3 has no DATE type: dates are stored as ISO strings, which is also how they sort and compare
+        return [tuple(value.isoformat() if hasattr(value, 'isoformat') else value for value in row)
+                for row in frame_to_rows(frame)]
+
+    def load_table(self, conn, table, data, **kwargs):
+        frame = to_frame(table, data)
+        rows = self.prepare_rows(frame)
+        start = time.perf_counter()
+        conn.executemany(self.insert_query(table, list(frame.columns)), rows)
+        conn.commit()
+        return self._report(table, len(rows), 'executemany', time.perf_counter() - start)
+
+
+class DuckDBBackend(StorageBackend):
+    name = 'duckdb'
+    placeholder = '?'
+    parallel_writes = False
+    # DuckDB refuses to ALTER or DROP a table while another table's foreign key references it, and runs ON CONFLICT DO
+    # UPDATE as a delete and insert, which the same foreign keys reject
+    supports_swap = False
+    supports_parent_upsert = False
+
+    def __init__(self, path=DUCKDB_PATH):
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError("The DuckDB backend requires duckdb: pip install duckdb") from e
+        self.duckdb = duckdb
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # DuckDB allows one read-write handle per file; connections are cursors on it
+        self.database = duckdb.connect(path)
+
+    @contextmanager
+    def connect(self):
+        conn = self.database.cursor()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def read_table(self, table, columns=None):
+        with self.connect() as conn:
+            return conn.execute(f"SELECT {', '.join(columns) if columns else '*'} FROM {table}").df()
+
+    def load_table(self, conn, table, data, **kwargs):
+        # The DataFrame is scanned directly by DuckDB instead of being bound row by row
+        frame = to_frame(table, data)
+        start = time.perf_counter()
+        conn.register('staging_frame', frame)
+        try:
+            conn.execute(f"INSERT INTO {table} ({', '.join(frame.columns)}) SELECT * FROM staging_frame")
+        finally:
+            conn.unregister('staging_frame')
+        return self._report(table, len(frame), 'DataFrame scan', time.perf_counter() - start)
+
+
+# 4. Choosing a backend
+# ---------------------------------------------------------------------------------------------------------------------------
+
+BACKENDS = {
+    'mysql': MySQLBackend,
+    'sqlite': SQLiteBackend,
+    'duckdb': DuckDBBackend,
+}
+
+
+def get_backend(name=None, **kwargs):
+    name = (name or os.environ.get('DTSC_BACKEND', 'mysql')).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend '{name}', expected one of {list(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
+
+
+# 5. Command line
+# ---------------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    from dataset_builder import build_dataset
+
+    parser = argparse.ArgumentParser(description='Generate, load and read back the dataset on any storage backend.')
+    parser.add_argument('--backend', default=None, choices=list(BACKENDS))
+    parser.add_argument('--scale-factor', default='SF1')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    backend = get_backend(args.backend)
+    timings = {}
+    start = time.perf_counter()
+    backend.create_tables()
+    timings['create_tables'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generated = build_dataset(args.scale_factor, args.seed, args.workers)
+    timings['generate'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend.load_dataset(generated)
+    timings['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    extracted = backend.read_tables()
+    timings['extract'] = time.perf_counter() - start
+
+    for table, frame in extracted.items():
+        print(f"{table:<17} {len(frame):>12,} rows read back")
+    for stage, seconds in timings.items():
+        print(f"{stage:<17} {seconds:>10.2f}s")
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the batched, checkpointed insertion in bulk_loader.py (runs on the SQLite fixture from conftest.py)
+
+import os
+
+import pandas as pd
+import pytest
+
+from bulk_loader import (bulk_load_table, clear_checkpoint, insert_batched, load_checkpoint, save_checkpoint,
+                         write_staging_file)
+from conftest import MySQLStyleConnection, MySQLStyleCursor
+from vectorized_generation import columns_to_rows, generate_cars_columns
+
+
+class LocalInfileError(Exception):
+    errno = 3948
+
+
+class NoLoadDataCursor(MySQLStyleCursor):
+    # Fails LOAD DATA like a server with local_infile=OFF
+    error = LocalInfileError
+
+    def execute(self, query, params=()):
+        if query.startswith('LOAD DATA'):
+            raise self.error('Loading local data is disabled')
+        super().execute(query, params)
+
+
+@pytest.fixture
+def no_load_data(mysql_style_conn, monkeypatch):
+    monkeypatch.setattr(MySQLStyleConnection, 'cursor', lambda self, **kwargs: NoLoadDataCursor(self.conn.cursor()))
+    return mysql_style_conn
+
+
+def _cars(num_records=25):
+    return columns_to_rows(generate_cars_columns(num_records, rng=0))
+
+
+def _count(conn, table):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+def test_completed_load_clears_its_checkpoint(mysql_style_conn, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    report = insert_batched(mysql_style_conn, 'Cars', _cars(), batch_size=10, checkpoint_path=path)
+    assert (report['rows'], report['batches']) == (25, 3)
+    assert 'Cars' not in load_checkpoint(path)
+
+
+def test_rerun_skips_rows_already_in_the_table(mysql_style_conn, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    insert_batched(mysql_style_conn, 'Cars', _cars(), batch_size=10, checkpoint_path=path)
+    report = insert_batched(mysql_style_conn, 'Cars', _cars(), batch_size=10, checkpoint_path=path)
+    assert (report['rows'], report['skipped']) == (0, 25)
+    assert _count(mysql_style_conn, 'Cars') == 25
+
+
+def test_load_truncate_reload(mysql_style_conn, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    insert_batched(mysql_style_conn, 'Cars', _cars(), batch_size=10, checkpoint_path=path)
+    mysql_style_conn.conn.execute("DELETE FROM Cars")
+    mysql_style_conn.commit()
+    report = insert_batched(mysql_style_conn, 'Cars', _cars(), batch_size=10, checkpoint_path=path)
+    assert (report['rows'], report['skipped']) == (25, 0)
+    assert _count(mysql_style_conn, 'Cars') == 25
+
+
+def test_stale_checkpoint_is_ignored_for_an_empty_table(mysql_style_conn, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    save_checkpoint('Cars', 20, path)
+    report = insert_batched(mysql_style_conn, 'Cars', _cars(), batch_size=10, checkpoint_path=path)
+    assert report['rows'] == 25
+
+
+def test_interrupted_load_resumes_after_the_checkpoint(mysql_style_conn, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    rows = _cars()
+    # Simulates a crash after the first two batches: they are committed and checkpointed, the rest never ran
+    insert_batched(mysql_style_conn, 'Cars', rows[:20], batch_size=10, checkpoint_path=path)
+    save_checkpoint('Cars', 20, path)
+    report = insert_batched(mysql_style_conn, 'Cars', rows, batch_size=10, checkpoint_path=path)
+    assert (report['rows'], report['skipped']) == (5, 20)
+    assert _count(mysql_style_conn, 'Cars') == 25
+
+
+def test_clear_checkpoint_keeps_other_tables(tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    save_checkpoint('Cars', 10, path)
+    save_checkpoint('Owners', 7, path)
+    clear_checkpoint(['Cars'], path)
+    assert load_checkpoint(path) == {'Owners': 7}
+    assert os.listdir(tmp_path) == ['checkpoint.json']
+
+
+def test_staging_file_escapes_text_and_nulls(tmp_path):
+    frame = pd.DataFrame({'Model': ['a\tb', 'c\\d', None], 'Year': [2001, 2002, 2003]})
+    path = write_staging_file(frame, str(tmp_path))
+    with open(path) as file:
+        assert file.read() == 'a\\tb\t2001\nc\\\\d\t2002\n\\N\t2003\n'
+
+
+def test_disabled_load_data_falls_back_to_multirow_insert(no_load_data):
+    report = bulk_load_table(no_load_data, 'Cars', _cars(), batch_rows=10)
+    assert (report['rows'], report['method']) == (25, 'multi-row INSERT')
+    assert _count(no_load_data, 'Cars') == 25
+
+
+def test_other_load_data_errors_are_raised(no_load_data, monkeypatch):
+    monkeypatch.setattr(NoLoadDataCursor, 'error', RuntimeError)
+    with pytest.raises(RuntimeError):
+        bulk_load_table(no_load_data, 'Cars', _cars())
+    assert _count(no_load_data, 'Cars') == 0
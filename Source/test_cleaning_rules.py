@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the cleaning filters pushed down into SQL by cleaning_rules.py (runs on an in-memory SQLite database)
+
+import pandas as pd
+import pytest
+
+from cleaning_rules import CLEANING_RULES, extract_clean_tables, sql_quantile
+from dataset_builder import build_dataset
+import storage_backends
+from storage_backends import SQLiteBackend
+
+
+@pytest.fixture(scope='module')
+def loaded():
+    dataset = build_dataset(0.5, num_workers=1, end_date='2024-06-30', tables=['Cars', 'Owners', 'OwnershipHistory'])
+    backend = SQLiteBackend(':memory:')
+    backend.create_tables()
+    backend.load_dataset(dataset)
+    return backend, dataset
+
+
+@pytest.mark.parametrize('q', [0, 0.37, 0.5, 0.99, 1])
+def test_sql_quantile_matches_pandas(loaded, q):
+    backend, dataset = loaded
+    with backend.connect() as conn:
+        assert sql_quantile(conn, 'Cars', 'Mileage', q) == pytest.approx(dataset['Cars']['Mileage'].quantile(q))
+
+
+def test_sql_quantile_of_an_empty_table(loaded):
+    backend, _ = loaded
+    with backend.connect() as conn:
+        assert sql_quantile(conn, 'Incidents', 'Cost', 0.5) is None
+
+
+def test_pushdown_returns_what_the_pandas_filters_kept(loaded):
+    backend, dataset = loaded
+    tables, thresholds = extract_clean_tables(tables=['Cars', 'OwnershipHistory'], connect=backend.connect,
+                                              placeholder='?')
+    cars = dataset['Cars']
+    threshold = cars['Mileage'].quantile(CLEANING_RULES['Cars']['quantile_max']['Mileage'])
+    assert thresholds[('Cars', 'Mileage')] == pytest.approx(threshold)
+    assert tables['Cars']['CarID'].tolist() == cars.loc[cars['Mileage'] <= threshold, 'CarID'].tolist()
+
+    history = dataset['OwnershipHistory']
+    keep = pd.Series(True, index=history.index)
+    for column, (start, end) in CLEANING_RULES['OwnershipHistory']['date_range'].items():
+        keep &= (history[column] >= pd.to_datetime(start)) & (history[column] <= pd.to_datetime(end))
+    assert tables['OwnershipHistory']['OwnershipID'].tolist() == history.loc[keep, 'OwnershipID'].tolist()
+    assert 0 < len(tables['OwnershipHistory']) < len(history)
+
+
+def test_reads_from_the_backend_named_by_dtsc_backend(loaded, monkeypatch):
+    backend, dataset = loaded
+    monkeypatch.setenv('DTSC_BACKEND', 'sqlite')
+    monkeypatch.setitem(storage_backends.BACKENDS, 'sqlite', lambda: backend)
+    tables, thresholds = extract_clean_tables(tables=['Cars', 'Owners'])
+    assert thresholds[('Cars', 'Mileage')] == pytest.approx(dataset['Cars']['Mileage'].quantile(0.99))
+    assert tables['Owners']['OwnerID'].tolist() == dataset['Owners']['OwnerID'].tolist()
+    assert 0 < len(tables['Cars']) < len(dataset['Cars'])
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the scale-factor dataset builder in dataset_builder.py
+
+import datetime
+
+import numpy as np
+import pytest
+
+from dataset_builder import TABLE_ORDER, build_dataset, iter_dataset, parse_scale_factor, table_sizes
+from vectorized_generation import find_orphans
+
+END_DATE = datetime.date(2023, 6, 30)
+
+
+def test_scale_factors():
+    assert parse_scale_factor('SF10') == parse_scale_factor(' sf10 ') == parse_scale_factor(10) == 10.0
+    assert table_sizes('SF2')['Features'] == 20000
+    with pytest.raises(ValueError):
+        parse_scale_factor(0)
+
+
+def test_options_reach_only_the_tables_that_take_them():
+    dataset = build_dataset(0.05, num_workers=1, end_date=END_DATE, skew={'CarID': 1.1})
+    assert list(dataset) == TABLE_ORDER
+    for table, column in (('Incidents', 'IncidentDate'), ('ServiceHistory', 'ServiceDate'), ('MarketTrends', 'Date'),
+                          ('OwnershipHistory', 'SaleDate')):
+        assert dataset[table][column].max() <= np.datetime64(END_DATE)
+
+
+def test_iter_dataset_matches_build_dataset():
+    built = build_dataset(0.05, seed=3, num_workers=1, end_date=END_DATE)
+    streamed = {}
+    for table, chunk in iter_dataset(0.05, seed=3, num_workers=1, end_date=END_DATE):
+        streamed.setdefault(table, []).append(chunk)
+    assert list(streamed) == TABLE_ORDER
+    for table, chunks in streamed.items():
+        for column in built[table].columns:
+            assert np.array_equal(np.concatenate([chunk[column] for chunk in chunks]), built[table][column].to_numpy())
+
+
+def test_foreign_keys_reference_existing_parents():
+    dataset = build_dataset(0.05, num_workers=1, end_date=END_DATE)
+    for table in TABLE_ORDER[1:]:
+        assert not find_orphans(dataset[table], 'CarID', dataset['Cars']['CarID']).any()
+    assert not find_orphans(dataset['OwnershipHistory'], 'OwnerID', dataset['Owners']['OwnerID']).any()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the connection pools in db_connection.py (no MySQL server needed: the pool class is replaced by a recorder)
+
+import mysql.connector.pooling
+import pytest
+
+import db_connection
+
+
+class RecordingPool:
+    def __init__(self, **config):
+        self.config = config
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    monkeypatch.setattr(mysql.connector.pooling, 'MySQLConnectionPool', RecordingPool)
+    monkeypatch.setattr(db_connection, '_pools', {})
+    return db_connection
+
+
+def test_only_the_loading_pool_allows_local_infile(pools):
+    assert 'allow_local_infile' not in pools.get_pool().config
+    assert pools.get_pool(local_infile=True).config['allow_local_infile'] is True
+    assert pools.get_pool().config['pool_name'] != pools.get_pool(local_infile=True).config['pool_name']
+
+
+def test_pools_are_created_once(pools):
+    assert pools.get_pool() is pools.get_pool()
+    assert pools.get_pool(local_infile=True) is pools.get_pool(local_infile=True)
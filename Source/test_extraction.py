@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the chunked, typed extraction in extraction.py (runs on an in-memory SQLite database)
+
+import pandas as pd
+import pytest
+
+from dataset_builder import build_dataset
+from extraction import extract_table, extract_tables, iter_table
+from storage_backends import SQLiteBackend
+
+
+@pytest.fixture(scope='module')
+def backend():
+    backend = SQLiteBackend(':memory:')
+    backend.create_tables()
+    backend.load_dataset(build_dataset(0.05, num_workers=1, end_date='2023-06-30'))
+    with backend.connect() as conn:
+        # One owner without a car, so Owners.CarID holds a NULL
+        conn.execute("INSERT INTO Owners (OwnerID, CarID, FirstName) VALUES (100000, NULL, 'Ada')")
+        conn.commit()
+    return backend
+
+
+def test_declared_column_types(backend):
+    with backend.connect() as conn:
+        cars = extract_table(conn, 'Cars', chunk_size=30)
+        history = extract_table(conn, 'OwnershipHistory', chunk_size=30)
+    assert cars['CarID'].dtype == 'int64' and cars['Mileage'].dtype == 'int64'
+    assert pd.api.types.is_string_dtype(cars['VIN'])
+    assert history['PurchaseDate'].dtype == 'datetime64[ns]' and history['SalePrice'].dtype == 'float64'
+
+
+def test_nulls_keep_integer_columns_nullable(backend):
+    with backend.connect() as conn:
+        # The NULL arrives in the last chunk only; the int64 chunks before it are combined into Int64
+        owners = extract_table(conn, 'Owners', chunk_size=40)
+    assert owners['CarID'].dtype == 'Int64'
+    assert owners['CarID'].isna().sum() == 1
+    assert owners['OwnerID'].dtype == 'int64'
+
+
+def test_chunks_with_filters_and_transform(backend):
+    with backend.connect() as conn:
+        chunks = list(iter_table(conn, 'Cars', chunk_size=25, columns=['CarID', 'Mileage'], where='Mileage > ?',
+                                 params=(100000,), transform=lambda chunk: chunk.assign(Km=chunk['Mileage'] * 1.609)))
+    assert all(len(chunk) <= 25 for chunk in chunks)
+    frame = pd.concat(chunks)
+    assert list(frame.columns) == ['CarID', 'Mileage', 'Km'] and (frame['Mileage'] > 100000).all()
+
+
+def test_empty_result_has_the_declared_types(backend):
+    with backend.connect() as conn:
+        empty = extract_table(conn, 'Cars', where='CarID < 0')
+    assert len(empty) == 0 and empty['CarID'].dtype == 'int64' and 'VIN' in empty.columns
+
+
+def test_extract_tables_reads_every_table(backend):
+    frames = extract_tables(['Cars', 'Owners'], connect=backend.connect, chunk_size=50)
+    assert len(frames['Cars']) == 100 and len(frames['Owners']) == 151
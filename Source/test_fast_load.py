@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the fast-load mode in fast_load.py (the foreign key checks run on the SQLite fixture from conftest.py)
+
+import contextlib
+import threading
+import time
+
+import pytest
+
+import fast_load
+from fast_load import fast_load_dataset, fast_load_table, verify_foreign_keys
+from schema import load_order
+
+
+class StatementLog:
+    # Connection and cursor in one that records every statement it is given
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self, **kwargs):
+        return self
+
+    def execute(self, query, params=()):
+        self.statements.append(query)
+
+    def close(self):
+        pass
+
+
+class SlowLoad:
+    # Records when each table starts and finishes loading
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def __call__(self, conn, table, data):
+        with self.lock:
+            self.events.append(('start', table))
+        time.sleep(0.05)
+        with self.lock:
+            self.events.append(('finish', table))
+        return {'table': table, 'rows': data}
+
+
+def _insert(conn, query, rows):
+    conn.conn.executemany(query, rows)
+    conn.commit()
+
+
+def test_checks_are_restored_after_a_failed_load():
+    def failing_load(conn, table, data):
+        conn.execute(f"INSERT INTO {table}")
+        raise RuntimeError('load failed')
+
+    conn = StatementLog()
+    with pytest.raises(RuntimeError):
+        fast_load_table(conn, 'Cars', [], load_table=failing_load)
+    assert conn.statements == ["SET SESSION foreign_key_checks = 0, unique_checks = 0", "INSERT INTO Cars",
+                               "SET SESSION foreign_key_checks = 1, unique_checks = 1"]
+
+
+def test_orphan_rows_are_reported(mysql_style_conn):
+    mysql_style_conn.conn.execute('PRAGMA foreign_keys = OFF')
+    _insert(mysql_style_conn, "INSERT INTO Cars (CarID) VALUES (?)", [(1,), (2,)])
+    _insert(mysql_style_conn, "INSERT INTO Owners (OwnerID, CarID) VALUES (?, ?)", [(1, 1), (2, 3), (3, None)])
+    _insert(mysql_style_conn, "INSERT INTO Features (FeatureID, CarID) VALUES (?, ?)", [(1, 2), (2, 7), (3, 8)])
+    violations = verify_foreign_keys(mysql_style_conn, load_order())
+    assert violations == [
+        {'table': 'Owners', 'column': 'CarID', 'references': 'Cars(CarID)', 'orphan_rows': 1},
+        {'table': 'Features', 'column': 'CarID', 'references': 'Cars(CarID)', 'orphan_rows': 2},
+    ]
+
+
+def test_consistent_tables_have_no_violations(mysql_style_conn):
+    _insert(mysql_style_conn, "INSERT INTO Cars (CarID) VALUES (?)", [(1,)])
+    _insert(mysql_style_conn, "INSERT INTO Features (FeatureID, CarID) VALUES (?, ?)", [(1, 1)])
+    assert verify_foreign_keys(mysql_style_conn) == []
+
+
+@contextlib.contextmanager
+def statement_log():
+    yield StatementLog()
+
+
+def test_fast_load_starts_every_table_at_once(monkeypatch):
+    for step in ('drop_secondary_indexes', 'build_secondary_indexes'):
+        monkeypatch.setattr(fast_load, step, lambda conn, tables: None)
+    monkeypatch.setattr(fast_load, 'verify_foreign_keys', lambda conn, tables: [])
+    load = SlowLoad()
+    monkeypatch.setattr(fast_load, 'fast_load_table', load)
+    tables = load_order()
+    result = fast_load_dataset({table: 1 for table in tables}, connect=statement_log, max_workers=len(tables))
+    assert len(result['tables']) == len(tables)
+    # Children do not wait for Cars and Owners: every table starts before the first one finishes
+    assert [kind for kind, _ in load.events[:len(tables)]] == ['start'] * len(tables)
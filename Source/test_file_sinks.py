@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for writing the generated tables to partitioned files with file_sinks.py
+
+import json
+
+import pytest
+
+from dataset_builder import TABLE_ORDER, table_sizes
+from file_sinks import read_table_files, write_dataset
+
+
+@pytest.mark.parametrize('file_format', ['csv.gz', 'csv'])
+def test_partitioned_files_and_manifest(tmp_path, file_format):
+    manifest = write_dataset(str(tmp_path), 0.05, file_format, num_workers=1, chunk_size=40)
+    assert json.loads((tmp_path / '_manifest.json').read_text()) == manifest
+    sizes = table_sizes(0.05)
+    for table in TABLE_ORDER:
+        entry = manifest['tables'][table]
+        assert entry['rows'] == sizes[table]
+        assert len(entry['files']) == -(-sizes[table] // 40)
+        assert all(path.endswith('.' + file_format) for path in entry['files'])
+    cars = read_table_files(str(tmp_path), 'Cars')
+    assert cars['CarID'].tolist() == list(range(1, sizes['Cars'] + 1))
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        write_dataset(str(tmp_path), 0.05, 'xlsx')
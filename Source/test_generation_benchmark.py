@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the generation benchmark in generation_benchmark.py
+
+import sys
+import time
+import tracemalloc
+
+from generation_benchmark import (LEGACY_FUNCTIONS, compare_runs, load_legacy_generators, run_benchmarks, save_results,
+                                  time_generator)
+from vectorized_generation import TABLE_COLUMNS
+
+
+def test_original_generators_load_without_mysql(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'mysql', None)
+    monkeypatch.setitem(sys.modules, 'mysql.connector', None)
+    legacy = load_legacy_generators()
+    assert list(legacy) == list(LEGACY_FUNCTIONS)
+    rows = legacy['Cars'](3)
+    assert len(rows) == 3 and len(rows[0]) == len(TABLE_COLUMNS['Cars'])
+
+
+def test_results_are_saved_and_compared(tmp_path):
+    path = str(tmp_path / 'benchmarks.jsonl')
+    results = run_benchmarks(row_counts=(100,), tables=['Cars'], include_legacy=False)
+    assert [(r['implementation'], r['table'], r['rows']) for r in results] == [('vectorized', 'Cars', 100)]
+    save_results(results, path)
+    assert compare_runs(path) == []
+    # Runs are told apart by their millisecond timestamp
+    time.sleep(0.01)
+    save_results([dict(result, rows_per_sec=result['rows_per_sec'] * 2) for result in results], path)
+    assert compare_runs(path) == [{'implementation': 'vectorized', 'table': 'Cars', 'rows': 100, 'change': 1.0}]
+
+
+def test_timed_run_is_not_traced():
+    tracing = []
+
+    def generator(num_records):
+        tracing.append(tracemalloc.is_tracing())
+        return bytearray(num_records)
+
+    seconds, peak = time_generator(generator, 10 ** 6)
+    assert tracing == [False, True]
+    assert seconds > 0 and peak >= 10 ** 6
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the idempotent loading in incremental_load.py (runs on an in-memory SQLite database)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_builder import build_dataset
+from incremental_load import ROW_HASH_DDL, ROW_HASH_TABLE, row_hashes, upsert_dataset, upsert_table
+from storage_backends import SQLiteBackend
+
+
+@pytest.fixture
+def backend():
+    backend = SQLiteBackend(':memory:')
+    backend.create_tables()
+    return backend
+
+
+class NoParentUpsertBackend(SQLiteBackend):
+    # SQLite standing in for DuckDB, which cannot update rows that foreign keys reference
+    name = 'duckdb'
+    supports_parent_upsert = False
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return build_dataset(0.02, seed=1, num_workers=1)
+
+
+def _counts(reports):
+    return {report['table']: (report['new'], report['changed'], report['unchanged']) for report in reports}
+
+
+def test_rerun_writes_nothing(backend, dataset):
+    first = _counts(upsert_dataset(backend, dataset))
+    assert all(changed == unchanged == 0 for _, changed, unchanged in first.values())
+    second = _counts(upsert_dataset(backend, dataset))
+    assert second == {table: (0, 0, len(dataset[table])) for table in dataset}
+    assert len(backend.read_table('Cars')) == len(dataset['Cars'])
+
+
+def test_only_new_and_changed_rows_are_written(backend, dataset):
+    upsert_dataset(backend, dataset)
+    cars = dataset['Cars'].copy()
+    cars.loc[cars.index[:3], 'Mileage'] += 1
+    new_car = cars.iloc[[0]].assign(CarID=cars['CarID'].max() + 1)
+    report = upsert_table(backend, 'Cars', pd.concat([cars, new_car], ignore_index=True))
+    assert (report['new'], report['changed'], report['unchanged']) == (1, 3, len(cars) - 3)
+    stored = backend.read_table('Cars').set_index('CarID')['Mileage']
+    assert stored.loc[cars['CarID'][:3]].tolist() == cars['Mileage'][:3].tolist()
+    assert len(stored) == len(cars) + 1
+
+
+def test_rows_loaded_without_hashes_are_overwritten_once(backend, dataset):
+    backend.load_dataset(dataset)
+    first = _counts(upsert_dataset(backend, dataset))
+    assert first == {table: (len(dataset[table]), 0, 0) for table in dataset}
+    assert len(backend.read_table('Cars')) == len(dataset['Cars'])
+    second = _counts(upsert_dataset(backend, dataset))
+    assert second == {table: (0, 0, len(dataset[table])) for table in dataset}
+
+
+def test_failed_batch_keeps_neither_rows_nor_hashes(backend, dataset):
+    backend.execute(ROW_HASH_DDL)
+    # The Cars these rows reference were never loaded, so the foreign key rejects the first batch
+    with pytest.raises(Exception, match='FOREIGN KEY'):
+        upsert_table(backend, 'Features', dataset['Features'])
+    assert backend.read_table('Features').empty and backend.read_table(ROW_HASH_TABLE).empty
+
+
+def test_referenced_rows_are_not_updated_without_backend_support(dataset):
+    backend = NoParentUpsertBackend(':memory:')
+    backend.create_tables()
+    # New rows, including a first load into empty tables, are plain inserts and still work
+    upsert_dataset(backend, dataset)
+    cars = dataset['Cars'].copy()
+    cars.loc[cars.index[:1], 'Mileage'] += 1
+    with pytest.raises(ValueError, match='Cars'):
+        upsert_table(backend, 'Cars', cars)
+    incidents = dataset['Incidents'].copy()
+    incidents.loc[incidents.index[:1], 'Description'] = 'Changed'
+    assert upsert_table(backend, 'Incidents', incidents)['changed'] == 1
+
+    # Rows loaded without hashes would be overwritten, so the first upsert of a referenced table is refused too
+    backend = NoParentUpsertBackend(':memory:')
+    backend.create_tables()
+    backend.load_dataset(dataset)
+    with pytest.raises(ValueError, match='Cars'):
+        upsert_dataset(backend, dataset)
+
+
+def test_hashes_ignore_the_column_dtype():
+    frame = pd.DataFrame({'CarID': [1, 2], 'Year': [2001, 2002]})
+    assert np.array_equal(row_hashes(frame), row_hashes(frame.astype({'Year': 'int32'})))
+    assert np.array_equal(row_hashes(frame), row_hashes(frame.astype({'Year': str})))
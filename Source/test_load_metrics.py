@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the load instrumentation and retries in load_metrics.py and the loaders that use them
+
+import json
+
+import pytest
+
+from bulk_loader import insert_batched, insert_multirow, load_data_infile, to_frame
+from conftest import MySQLStyleConnection, MySQLStyleCursor
+from load_metrics import LoadMetrics, run_with_retries, save_report
+from vectorized_generation import columns_to_rows, generate_cars_columns
+
+
+class Deadlock(Exception):
+    errno = 1213
+
+
+class DeadlockOnceCursor(MySQLStyleCursor):
+    # Fails the first INSERT or LOAD DATA statement with a deadlock and runs everything after it; LOAD DATA is a no-op
+    failed = []
+
+    def execute(self, query, params=()):
+        if query.startswith(('INSERT', 'LOAD DATA')) and not self.failed:
+            self.failed.append(query)
+            raise Deadlock('Deadlock found when trying to get lock')
+        if not query.startswith('LOAD DATA'):
+            super().execute(query, params)
+
+    def executemany(self, query, rows):
+        if not self.failed:
+            self.failed.append(query)
+            raise Deadlock('Deadlock found when trying to get lock')
+        super().executemany(query, rows)
+
+
+@pytest.fixture
+def deadlock_once(mysql_style_conn, monkeypatch):
+    monkeypatch.setattr(DeadlockOnceCursor, 'failed', [])
+    monkeypatch.setattr(MySQLStyleConnection, 'cursor', lambda self, **kwargs: DeadlockOnceCursor(self.conn.cursor()))
+    return mysql_style_conn
+
+
+def _cars(num_records=25):
+    return columns_to_rows(generate_cars_columns(num_records, rng=0))
+
+
+def _count(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM Cars")
+    return cursor.fetchone()[0]
+
+
+def test_table_report():
+    metrics = LoadMetrics()
+    for seconds in (0.001, 0.002, 0.004, 0.5):
+        metrics.record_batch('Cars', 100, seconds, 1000)
+    metrics.record_retry('Cars')
+    report = metrics.table_report('Cars')
+    assert (report['rows'], report['batches'], report['bytes_sent'], report['retries']) == (400, 4, 4000, 1)
+    assert report['latency_ms']['max'] == 500
+    assert sum(report['latency_histogram'].values()) == 4
+
+
+def test_retries_stop_at_errors_that_cannot_be_retried(mysql_style_conn):
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise ValueError('not a lock error')
+
+    with pytest.raises(ValueError):
+        run_with_retries(fail, mysql_style_conn, 'Cars')
+    assert len(calls) == 1
+
+
+def test_insert_batched_retries_a_deadlocked_batch(deadlock_once, tmp_path):
+    metrics = LoadMetrics()
+    insert_batched(deadlock_once, 'Cars', _cars(), batch_size=10, checkpoint_path=str(tmp_path / 'c.json'),
+                   metrics=metrics)
+    report = metrics.table_report('Cars')
+    assert (report['rows'], report['batches'], report['retries']) == (25, 3, 1)
+    assert _count(deadlock_once) == 25
+
+
+def test_multirow_insert_retries_the_whole_transaction(deadlock_once):
+    metrics = LoadMetrics()
+    insert_multirow(deadlock_once, 'Cars', to_frame('Cars', _cars()), batch_rows=10, metrics=metrics)
+    report = metrics.table_report('Cars')
+    assert (report['rows'], report['batches'], report['retries']) == (25, 3, 1)
+    assert _count(deadlock_once) == 25
+
+
+def test_load_data_is_retried(deadlock_once, tmp_path):
+    metrics = LoadMetrics()
+    load_data_infile(deadlock_once, 'Cars', to_frame('Cars', _cars()), str(tmp_path), metrics)
+    report = metrics.table_report('Cars')
+    assert (report['rows'], report['batches'], report['retries']) == (25, 1, 1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_save_report_appends_json_lines(tmp_path):
+    path = tmp_path / 'load_metrics.jsonl'
+    save_report([], str(path), batch_size=10)
+    save_report([], str(path), batch_size=20)
+    runs = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [run['batch_size'] for run in runs] == [10, 20]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the generation/insertion pipeline in load_pipeline.py (the writers load into a recorder, not a database)
+
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+import load_pipeline
+from load_pipeline import run_pipeline
+from schema import dependencies
+
+
+@contextmanager
+def no_connection():
+    yield None
+
+
+class Recorder:
+    def __init__(self, delay=0.0, fail_on=None):
+        self.lock = threading.Lock()
+        self.written = []
+        self.delay = delay
+        self.fail_on = fail_on
+
+    def __call__(self, conn, table, chunk, **kwargs):
+        time.sleep(self.delay)
+        if table == self.fail_on:
+            raise RuntimeError(f'{table} failed')
+        with self.lock:
+            self.written.append(table)
+        return {'rows': len(chunk['CarID'])}
+
+
+def run_with_timeout(seconds=30, **kwargs):
+    # Runs the pipeline in a thread so a deadlock fails the test instead of hanging it
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = run_pipeline(connect=no_connection, **kwargs)
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), 'pipeline did not finish'
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+
+def test_parents_are_written_before_their_children():
+    recorder = Recorder()
+    result = run_with_timeout(scale_factor=0.1, num_generators=1, num_writers=4, queue_size=3, chunk_size=50,
+                              load_chunk=recorder, end_date='2023-06-30')
+    assert result['rows']['Features'] == 1000
+    for table, parents in dependencies().items():
+        for parent in parents:
+            last_parent = max(i for i, written in enumerate(recorder.written) if written == parent)
+            assert last_parent < recorder.written.index(table)
+
+
+def test_writer_error_is_raised():
+    with pytest.raises(RuntimeError, match='Owners failed'):
+        run_with_timeout(scale_factor=0.1, num_generators=1, num_writers=3, queue_size=2, chunk_size=50,
+                         load_chunk=Recorder(fail_on='Owners'))
+
+
+def test_producer_error_stops_every_writer(monkeypatch):
+    def failing_dataset(**kwargs):
+        for number in range(6):
+            yield 'Cars', {'CarID': [number]}
+        raise ValueError('generation failed')
+
+    # Four slow writers each hold a chunk while two more fill the queue, so the stop markers meet a full queue
+    monkeypatch.setattr(load_pipeline, 'iter_dataset', failing_dataset)
+    with pytest.raises(ValueError, match='generation failed'):
+        run_with_timeout(seconds=10, num_writers=4, queue_size=2, load_chunk=Recorder(delay=0.5))
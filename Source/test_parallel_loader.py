@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the dependency-ordered concurrent loading in parallel_loader.py
+
+import contextlib
+import threading
+import time
+
+import pytest
+
+from parallel_loader import load_tables_parallel
+from schema import dependencies, load_order
+
+
+class Recorder:
+    # Stands in for bulk_load_table: records when each table starts and finishes, and fails the tables in fail
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.events = []
+        self.lock = threading.Lock()
+
+    def __call__(self, conn, table, data):
+        with self.lock:
+            self.events.append(('start', table))
+        time.sleep(0.02)
+        with self.lock:
+            self.events.append(('finish', table))
+        if table in self.fail:
+            raise RuntimeError(f'{table} failed')
+        return {'table': table, 'rows': data}
+
+
+@contextlib.contextmanager
+def no_connection():
+    yield None
+
+
+def _dataset():
+    return {table: 10 for table in load_order()}
+
+
+def test_parents_finish_before_children_start():
+    recorder = Recorder()
+    reports = load_tables_parallel(_dataset(), load_table=recorder, connect=no_connection)
+    assert sorted(report['table'] for report in reports) == sorted(load_order())
+    position = {event: index for index, event in enumerate(recorder.events)}
+    for table, parents in dependencies().items():
+        for parent in parents:
+            assert position[('finish', parent)] < position[('start', table)]
+    # The tables that only need Cars run at the same time
+    starts = [table for kind, table in recorder.events[2:8] if kind == 'start']
+    assert len(starts) == 6
+
+
+def test_failed_table_skips_its_dependents():
+    recorder = Recorder(fail={'Owners'})
+    with pytest.raises(RuntimeError, match='Owners'):
+        load_tables_parallel(_dataset(), load_table=recorder, connect=no_connection)
+    assert ('start', 'OwnershipHistory') not in recorder.events
+    assert ('finish', 'MarketTrends') in recorder.events
+
+
+def test_unknown_table():
+    with pytest.raises(ValueError):
+        load_tables_parallel({'Trucks': 1}, load_table=Recorder(), connect=no_connection)
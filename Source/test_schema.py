@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the Table_Creation.sql parser in schema.py
+
+import pytest
+
+from schema import base_table_name, load_levels, load_order, load_schema, parse_schema
+from vectorized_generation import TABLE_COLUMNS
+
+SQL = """
+CREATE TABLE Parent (
+    ParentID INT PRIMARY KEY,
+    Price DECIMAL(10, 2)
+);
+
+CREATE TABLE Child (
+    ChildID INT,
+    ParentID INT,
+    PRIMARY KEY (ChildID),
+    FOREIGN KEY (ParentID) REFERENCES Parent(ParentID)
+);
+"""
+
+
+def test_columns_and_keys():
+    schema = parse_schema(SQL)
+    assert schema['Parent']['columns'] == [('ParentID', 'INT'), ('Price', 'DECIMAL(10, 2)')]
+    assert schema['Parent']['primary_key'] == ['ParentID']
+    assert schema['Child']['primary_key'] == ['ChildID']
+    assert schema['Child']['foreign_keys'] == [('ParentID', 'Parent', 'ParentID')]
+
+
+def test_table_creation_sql_matches_the_generators():
+    schema = load_schema()
+    assert {table: [name for name, _ in info['columns']] for table, info in schema.items()} == TABLE_COLUMNS
+
+
+def test_load_levels():
+    assert load_levels() == [['Cars'],
+                             ['Owners', 'VehicleCondition', 'Features', 'Incidents', 'ServiceHistory', 'MarketTrends'],
+                             ['OwnershipHistory']]
+    assert load_order(parse_schema(SQL)) == ['Parent', 'Child']
+
+
+def test_foreign_key_cycle():
+    sql = SQL + "CREATE TABLE Parent (ParentID INT, FOREIGN KEY (ParentID) REFERENCES Child(ChildID));"
+    with pytest.raises(ValueError):
+        load_levels(parse_schema(sql))
+
+
+def test_base_table_name():
+    assert base_table_name('Cars__staging') == base_table_name('Cars') == 'Cars'
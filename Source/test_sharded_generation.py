@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the sharded generation in sharded_generation.py
+
+import datetime
+
+import numpy as np
+
+from sharded_generation import generate_table_sharded, iter_table_chunks, shard_bounds
+from vectorized_generation import TABLE_COLUMNS
+
+END_DATE = datetime.date(2024, 1, 1)
+
+
+def assert_same_columns(first, second):
+    assert list(first) == list(second)
+    for column in first:
+        assert np.array_equal(first[column], second[column])
+
+
+def test_shard_bounds_cover_every_id_once():
+    assert shard_bounds(10, 4) == [(0, 1, 4), (1, 5, 4), (2, 9, 2)]
+    assert shard_bounds(0, 4) == []
+
+
+def test_output_does_not_depend_on_the_number_of_workers():
+    for table in ('Cars', 'Incidents', 'OwnershipHistory'):
+        kwargs = {'end_date': END_DATE} if table != 'Cars' else {}
+        one = generate_table_sharded(table, 2000, seed=5, num_workers=1, shard_size=500, **kwargs)
+        two = generate_table_sharded(table, 2000, seed=5, num_workers=2, shard_size=500, **kwargs)
+        assert_same_columns(one, two)
+
+
+def test_chunks_concatenate_to_the_whole_table():
+    chunks = list(iter_table_chunks('Cars', 1100, seed=2, num_workers=1, chunk_size=500))
+    assert [len(chunk['CarID']) for chunk in chunks] == [500, 500, 100]
+    whole = generate_table_sharded('Cars', 1100, seed=2, num_workers=1, shard_size=500)
+    assert_same_columns({column: np.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0]}, whole)
+    assert np.array_equal(whole['CarID'], np.arange(1, 1101))
+
+
+def test_ownership_chains_keep_each_car_in_one_shard():
+    car_ids = np.arange(1, 401)
+    chunks = iter_table_chunks('OwnershipHistory', 2000, seed=1, chunk_size=500, car_ids=car_ids, end_date=END_DATE)
+    cars_per_shard = [set(chunk['CarID'].tolist()) for chunk in chunks]
+    assert sum(len(cars) for cars in cars_per_shard) == len(set().union(*cars_per_shard))
+
+
+def test_empty_table():
+    assert list(generate_table_sharded('Cars', 0, num_workers=1)) == TABLE_COLUMNS['Cars']
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the staging-table reload in staging_swap.py (runs on an in-memory SQLite database)
+
+import pytest
+
+from dataset_builder import build_dataset
+from incremental_load import ROW_HASH_TABLE, upsert_dataset
+from schema import STAGING_SUFFIX, load_order
+from staging_swap import OLD_SUFFIX, reload_with_swap, staging_ddl, staging_name
+from storage_backends import SQLiteBackend
+
+
+@pytest.fixture
+def backend():
+    backend = SQLiteBackend(':memory:')
+    backend.create_tables()
+    return backend
+
+
+def _fetch(backend, query):
+    with backend.connect() as conn:
+        return conn.execute(query).fetchall()
+
+
+def test_staging_ddl_points_at_staging_parents():
+    sql = staging_ddl('OwnershipHistory')
+    assert f"CREATE TABLE {staging_name('OwnershipHistory')}" in sql
+    assert f"REFERENCES {staging_name('Cars')}" in sql and f"REFERENCES {staging_name('Owners')}" in sql
+
+
+def test_swap_replaces_every_table_and_keeps_foreign_keys(backend):
+    old, new = build_dataset(0.02, seed=1, num_workers=1), build_dataset(0.02, seed=2, num_workers=1)
+    backend.load_dataset(old)
+    reload_with_swap(new, backend)
+
+    assert backend.table_names() == set(load_order())
+    assert backend.read_table('Cars')['VIN'].tolist() == new['Cars']['VIN'].tolist()
+    assert _fetch(backend, 'PRAGMA foreign_key_check') == []
+    # The children reference the live parents, not the staging or old copies
+    for (sql,) in _fetch(backend, "SELECT sql FROM sqlite_master WHERE type = 'table'"):
+        assert STAGING_SUFFIX not in sql and OLD_SUFFIX not in sql
+
+
+def test_swap_clears_the_row_hashes_of_swapped_tables(backend):
+    old, new = build_dataset(0.02, seed=1, num_workers=1), build_dataset(0.02, seed=2, num_workers=1)
+    upsert_dataset(backend, old)
+    reload_with_swap(new, backend)
+    assert _fetch(backend, f"SELECT COUNT(*) FROM {ROW_HASH_TABLE}") == [(0,)]
+
+    # Upserting the old data again has to rewrite the rows the swap replaced
+    reports = upsert_dataset(backend, old)
+    assert all(report['new'] == report['rows'] for report in reports)
+    assert backend.read_table('Cars')['VIN'].tolist() == old['Cars']['VIN'].tolist()
+
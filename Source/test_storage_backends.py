@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the storage backends in storage_backends.py (SQLite only; MySQL and DuckDB are not needed)
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from dataset_builder import TABLE_ORDER, build_dataset
+from schema import load_order
+from staging_swap import reload_with_swap
+from storage_backends import DuckDBBackend, SQLiteBackend, get_backend
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return build_dataset(0.02, num_workers=1, end_date='2023-06-30')
+
+
+def test_sqlite_round_trip(dataset):
+    backend = SQLiteBackend(':memory:')
+    backend.create_tables()
+    reports = backend.load_dataset(dataset)
+    assert [report['table'] for report in reports] == load_order()
+    extracted = backend.read_tables()
+    for table in TABLE_ORDER:
+        assert len(extracted[table]) == len(dataset[table])
+        assert extracted[table]['CarID'].tolist() == dataset[table]['CarID'].tolist()
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend('oracle')
+
+
+def test_sqlite_backend_runs_without_mysql_connector():
+    # A None entry in sys.modules makes "import mysql" fail as if the package were not installed
+    script = ("import sys; sys.modules['mysql'] = None\n"
+              "from storage_backends import SQLiteBackend\n"
+              "from staging_swap import reload_with_swap\n"
+              "from incremental_load import upsert_dataset\n"
+              "from dataset_builder import build_dataset\n"
+              "backend = SQLiteBackend(':memory:')\n"
+              "backend.create_tables()\n"
+              "backend.load_dataset(build_dataset(0.01, num_workers=1))\n"
+              "assert 'Cars' in backend.table_names()\n")
+    result = subprocess.run([sys.executable, '-c', script], cwd=SOURCE_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_duckdb_swap_is_refused_before_touching_the_database(dataset):
+    # Created without __init__, so duckdb itself does not have to be installed
+    backend = DuckDBBackend.__new__(DuckDBBackend)
+    with pytest.raises(ValueError, match='cannot rename or drop'):
+        reload_with_swap(dataset, backend)
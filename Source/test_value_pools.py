@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the cached Faker value pools in value_pools.py
+
+import os
+
+import numpy as np
+import pytest
+
+import value_pools
+from value_pools import FAKER_VERSION, get_pool, pool_path, sample_pool
+
+
+@pytest.fixture
+def pool_dir(tmp_path, monkeypatch):
+    # Builds pools in a temporary folder and keeps them out of the in-memory cache of the other tests
+    monkeypatch.setattr(value_pools, 'POOL_DIR', str(tmp_path))
+    get_pool.cache_clear()
+    yield tmp_path
+    get_pool.cache_clear()
+
+
+def test_pool_file_names_the_seed_and_faker_version(pool_dir):
+    path = pool_path('email', 10, seed=3)
+    assert os.path.dirname(path) == str(pool_dir)
+    assert 'seed3' in os.path.basename(path) and FAKER_VERSION in os.path.basename(path)
+
+
+def test_pool_is_built_once_and_reloaded_from_disk(pool_dir):
+    built = get_pool('state_abbr', 20, seed=1)
+    assert os.listdir(pool_dir) == [os.path.basename(pool_path('state_abbr', 20, seed=1))]
+    get_pool.cache_clear()
+    assert np.array_equal(get_pool('state_abbr', 20, seed=1), built)
+    assert not np.array_equal(get_pool('state_abbr', 20, seed=2), built)
+
+
+def test_samples_come_from_the_pool():
+    values = sample_pool(np.random.default_rng(0), 'last_name', 1000)
+    assert len(values) == 1000
+    assert set(values) <= set(get_pool('last_name'))
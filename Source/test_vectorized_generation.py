@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the vectorized generators in vectorized_generation.py
+
+import datetime
+
+import numpy as np
+import pytest
+
+from vectorized_generation import (GENERATORS, OWNERSHIP_YEARS_BACK, TABLE_COLUMNS, find_orphans,
+                                   generate_ownership_chains_columns, generate_table, key_space)
+
+END_DATE = datetime.date(2024, 1, 1)
+SPAN = OWNERSHIP_YEARS_BACK * 365
+
+
+def test_generators_return_the_table_columns():
+    for table, generate in GENERATORS.items():
+        columns = generate(50, rng=0)
+        assert list(columns) == TABLE_COLUMNS[table]
+        assert all(len(values) == 50 for values in columns.values())
+
+
+def test_same_seed_same_table():
+    for table in GENERATORS:
+        first, second = (generate_table(table, 200, rng=7, start_id=11) for _ in range(2))
+        assert first.equals(second)
+        assert first.iloc[:, 0].tolist() == list(range(11, 211))
+
+
+def test_foreign_keys_come_from_the_parent_keys():
+    cars = generate_table('Cars', 30, rng=0)
+    cars = cars[cars['CarID'] % 3 != 0]
+    car_ids = key_space(cars, 'CarID')
+    incidents = generate_table('Incidents', 500, rng=0, car_ids=car_ids, end_date=END_DATE)
+    assert set(incidents['CarID']) <= set(car_ids)
+    assert not find_orphans(incidents, 'CarID', car_ids).any()
+    assert find_orphans(incidents, 'CarID', car_ids[1:]).any()
+
+
+def assert_valid_chains(columns, end_date=END_DATE):
+    window_start = np.datetime64(end_date, 'D') - np.timedelta64(SPAN, 'D')
+    cars, purchases, sales = columns['CarID'], columns['PurchaseDate'], columns['SaleDate']
+    assert (purchases >= window_start).all() and (sales <= np.datetime64(end_date, 'D')).all()
+    assert (sales >= purchases).all()
+    # Within a car, every sale comes before the next owner's purchase
+    same_car = cars[1:] == cars[:-1]
+    assert (np.diff(cars) >= 0).all()
+    assert (sales[:-1][same_car] < purchases[1:][same_car]).all()
+
+
+def test_chains_are_ordered_and_inside_the_window():
+    columns = generate_ownership_chains_columns(20000, rng=0, end_date=END_DATE)
+    assert_valid_chains(columns)
+
+
+def test_skewed_chains_stay_inside_the_window():
+    columns = generate_ownership_chains_columns(100000, rng=0, car_ids=np.arange(1, 2001), end_date=END_DATE,
+                                                skew={'CarID': 1.1})
+    assert len(columns['CarID']) == 100000
+    assert np.bincount(columns['CarID']).max() <= SPAN
+    assert_valid_chains(columns)
+
+
+def test_skew_follows_the_global_key_space_across_partitions():
+    car_ids = np.arange(1, 2001)
+    parts = [generate_ownership_chains_columns(2000, rng=part, car_ids=car_ids, end_date=END_DATE,
+                                               car_partition=(part, 4), skew={'CarID': 1.1}) for part in range(4)]
+    # Partition p starts with the car ranked p in the whole key space, so the first partition holds the hottest car
+    # and each later partition's hottest car is colder
+    hottest = [np.bincount(columns['CarID']).max() for columns in parts]
+    assert hottest == sorted(hottest, reverse=True) and hottest[0] > hottest[-1] * 1.5
+    assert [np.bincount(columns['CarID']).argmax() for columns in parts] == [1, 2, 3, 4]
+    for columns in parts:
+        assert_valid_chains(columns)
+
+
+def test_too_many_ownerships_for_the_cars():
+    with pytest.raises(ValueError):
+        generate_ownership_chains_columns(2 * SPAN + 1, rng=0, car_ids=[1, 2], end_date=END_DATE)
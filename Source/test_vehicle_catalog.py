@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the make/model/year catalog in vehicle_catalog.py
+
+import numpy as np
+import pandas as pd
+
+from vehicle_catalog import catalog_frame, load_catalog, sample_vehicles
+
+
+def _sample(num_records, make_exponent=None, model_exponent=None):
+    makes, models, years = sample_vehicles(np.random.default_rng(0), num_records, make_exponent, model_exponent)
+    return pd.DataFrame({'Make': makes, 'Model': models, 'Year': years})
+
+
+def _all_in_catalog(sample):
+    matched = sample.merge(catalog_frame().drop_duplicates(), on=['Make', 'Model', 'Year'], how='left', indicator=True)
+    return (matched['_merge'] == 'both').all()
+
+
+def test_samples_are_catalog_combinations():
+    assert _all_in_catalog(_sample(20000))
+    assert _all_in_catalog(_sample(20000, make_exponent=1.2, model_exponent=1.0))
+
+
+def test_skew_favours_the_first_make_and_model():
+    catalog = load_catalog()
+    sample = _sample(50000, make_exponent=1.5, model_exponent=1.5)
+    assert sample['Make'].value_counts().index[0] == catalog['make_names'][0]
+    first_make = sample[sample['Make'] == catalog['make_names'][0]]
+    assert first_make['Model'].value_counts().index[0] == catalog['model'][0]
+    assert sample['Make'].value_counts().iloc[0] > 2 * _sample(50000)['Make'].value_counts().iloc[0]
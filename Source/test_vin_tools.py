@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Tests for the VIN generation and checks in vin_tools.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vin_tools import SERIAL_SPACE, check_digit_valid, find_duplicate_vins, generate_vins, vin_report
+
+# A real VIN with a correct check digit (X in position 9)
+KNOWN_VIN = '1M8GDM9AXKP042788'
+
+
+def test_generated_vins_are_unique_and_valid():
+    vins = generate_vins(np.arange(1, 200001), np.random.default_rng(0))
+    assert len(set(vins)) == 200000
+    assert check_digit_valid(vins).all()
+
+
+def test_same_serial_same_serial_part():
+    first = generate_vins([5, 6], np.random.default_rng(1))
+    second = generate_vins([5, 6], np.random.default_rng(2))
+    assert [vin[10:] for vin in first] == [vin[10:] for vin in second]
+    with pytest.raises(ValueError):
+        generate_vins([SERIAL_SPACE], np.random.default_rng(0))
+
+
+def test_check_digit_rejects_bad_vins():
+    vins = [KNOWN_VIN, KNOWN_VIN.lower(), KNOWN_VIN.replace('X', '5'), KNOWN_VIN[:16], 'IM8GDM9AXKP042788', None]
+    assert check_digit_valid(vins).tolist() == [True, True, False, False, False, False]
+
+
+def test_duplicate_report():
+    cars = pd.DataFrame({'CarID': [1, 2, 3, 4], 'VIN': [KNOWN_VIN, 'BAD', KNOWN_VIN, '5' * 17]})
+    assert find_duplicate_vins(cars)['CarID'].tolist() == [1, 3]
+    assert vin_report(cars) == {'rows': 4, 'duplicate_rows': 2, 'duplicate_vins': 1, 'invalid_check_digits': 1}
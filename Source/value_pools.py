@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module keeps cached pools of Faker values (first names, last names, emails and states) for the vectorized
+# generators: each provider is called a fixed number of times once, the results are saved to disk, and rows are drawn
+# from the pool by random index.
+#
+#    Pool Settings: the size of every pool and the folder the pools are saved in (DTSC_POOL_DIR overrides it).
+#
+#    Building and Loading Pools: a pool is looked up in memory, then on disk, and only built with Faker when neither
+#    exists. The file name includes the seed and Faker version, so a Faker upgrade or another seed builds a fresh pool.
+#
+#    Sampling: drawing any number of values from a pool with a NumPy random Generator.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import os
+from functools import lru_cache
+
+import numpy as np
+from faker import Faker
+from faker import VERSION as FAKER_VERSION
+
+
+# 2. Pool settings
+# ---------------------------------------------------------------------------------------------------------------------------
+
+POOL_DIR = os.environ.get('DTSC_POOL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data', 'Pools'))
+
+# Number of Faker calls made for each pool. Names and states repeat quickly, emails need a larger pool to stay varied.
+POOL_SIZES = {
+    'first_name': 50000,
+    'last_name': 50000,
+    'email': 100000,
+    'state_abbr': 5000,
+}
+
+
+# 3. Building and loading pools
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def pool_path(method, size, seed=0):
+    return os.path.join(POOL_DIR, f'{method}_{size}_seed{seed}_faker{FAKER_VERSION}.npy')
+
+
+def build_pool(method, size, seed=0):
+    fake = Faker()
+    fake.seed_instance(seed)
+    provider = getattr(fake, method)
+    return np.array([provider() for _ in range(size)], dtype=str)
+
+
+def _save_pool(values, path):
+    # Written to a temporary file first so a concurrent reader never sees a half-written pool
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        np.save(file, values, allow_pickle=False)
+    os.replace(temp_path, path)
+
+
+@lru_cache(maxsize=None)
+def get_pool(method, size=None, seed=0):
+    size = POOL_SIZES[method] if size is None else size
+    path = pool_path(method, size, seed)
+    if os.path.exists(path):
+        values = np.load(path, allow_pickle=False)
+    else:
+        values = build_pool(method, size, seed)
+        try:
+            _save_pool(values, path)
+        except OSError as e:
+            print(f"Could not save value pool to {path}: {e}")
+    return values.astype(object)
+
+
+def warm_pools():
+    # Loads (or builds) every pool up front, e.g. in the parent process before worker processes start reading them
+    for method in POOL_SIZES:
+        get_pool(method)
+
+
+# 4. Sampling
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def sample_pool(rng, method, num_records):
+    values = get_pool(method)
+    return values[rng.integers(0, len(values), size=num_records)]
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,424 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module holds NumPy versions of the data generating functions in "Database Data Insertion.py": every column of a
+# table is drawn at once with a NumPy random Generator instead of one Faker call per row.
+#
+#    Table Schemas and Value Lists: the column order of every table (matching the INSERT queries used for MySQL) and the
+#    categorical values that the original functions passed to fake.random_element().
+#
+#    Helper Functions: sampling of categorical values, dates, prices and foreign keys. Names, emails and states come by
+#    index from the cached Faker value pools, Make/Model/Year as valid combinations from the vehicle catalog, VINs are
+#    unique per CarID with a valid check digit. key_space() and find_orphans() check a child table against its parent.
+#
+#    Vectorized Data Generating Functions: one function per table, returning a dictionary of column name -> NumPy array
+#    with the same columns as the original generate_*_data(). OwnershipHistory is also available as ownership chains:
+#    per car, a sorted sequence of non-overlapping ownerships with depreciating prices.
+#
+#    Output Helpers: column dictionaries to a list of tuples for cursor.executemany() or to a pandas DataFrame.
+#
+# Child tables draw their foreign keys from the parent key arrays (car_ids, owner_ids), so the tables stay consistent at
+# any size. skew maps a column (CarID, OwnerID, Make, Model) to a Zipf exponent to draw it with hot keys instead of
+# uniformly, for example {'CarID': 1.1, 'Make': 1.2}. Every function takes a Generator or seed, a start_id so a table
+# can be produced in pieces, and tables with dates take an end_date (default: today) that fixes the date window.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from value_pools import sample_pool
+from vehicle_catalog import sample_vehicles
+from vin_tools import generate_vins
+
+
+# 2. Table schemas and value lists
+# ---------------------------------------------------------------------------------------------------------------------------
+
+# Column order of each table, identical to the INSERT queries in "Database Data Insertion.py"
+TABLE_COLUMNS = {
+    'Cars': ['CarID', 'Make', 'Model', 'Year', 'Mileage', 'VIN', 'EngineType', 'TransmissionType', 'FuelType'],
+    'Owners': ['OwnerID', 'CarID', 'FirstName', 'LastName', 'ContactInfo', 'State'],
+    'OwnershipHistory': ['OwnershipID', 'CarID', 'OwnerID', 'PurchaseDate', 'SaleDate', 'SalePrice'],
+    'VehicleCondition': ['ConditionID', 'CarID', 'OverallCondition', 'ExteriorCondition', 'InteriorCondition'],
+    'Features': ['FeatureID', 'CarID', 'FeatureName', 'FeatureValue'],
+    'Incidents': ['IncidentID', 'CarID', 'IncidentDate', 'Description', 'Cost'],
+    'ServiceHistory': ['ServiceID', 'CarID', 'ServiceDate', 'ServiceType', 'Cost'],
+    'MarketTrends': ['TrendID', 'CarID', 'Date', 'AverageSalePrice', 'MarketDemand'],
+}
+
+ENGINE_TYPES = ('2-Cylinder', '3-Cylinder', '4-Cylinder', '5-Cylinder', '6-Cylinder', '8-Cylinder', '10-Cylinder+')
+TRANSMISSION_TYPES = ('Automatic', 'Manual', 'CVT')
+FUEL_TYPES = ('Gasoline', 'Diesel', 'Hybrid', 'Electric')
+OVERALL_CONDITIONS = ('Excellent', 'Good', 'Fair', 'Poor')
+EXTERIOR_CONDITIONS = ('Clean', 'Minor Scratches', 'Dents', 'Needs Repairs')
+INTERIOR_CONDITIONS = ('Clean', 'Minor Wear', 'Torn Upholstery', 'Needs Cleaning')
+FEATURES_LIST = ('Air Conditioning', 'Power Windows', 'ABS', 'Cruise Control', 'Bluetooth', 'Backup Camera')
+FEATURE_VALUES = ('Yes', 'No')
+INCIDENT_DESCRIPTIONS = ('Driving under the influence', 'Distracted driving', 'Head-on collision', 'Speeding',
+                         'Rear-end collision', 'Drowsy driving', 'Rollover', 'Aggressive driving', 'Side-impact collision',
+                         'Improper turns', 'Pedestrian accident', 'Sideswipe collision')
+SERVICE_TYPES = ('Oil Change', 'Brake Inspection', 'Tire Rotation', 'Engine Tune-up')
+
+# The original functions assumed these table sizes when drawing CarID and OwnerID values. They are only used as the key
+# space when no parent key array is passed in.
+DEFAULT_NUM_CARS = 2000
+DEFAULT_NUM_OWNERS = 3000
+
+
+# 3. Helper functions
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def make_rng(rng=None):
+    # Accepts a Generator, a seed, or None (fresh entropy)
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng)
+
+
+def _today():
+    return np.datetime64(datetime.date.today(), 'D')
+
+
+def _choice(rng, elements, num_records):
+    # Vectorized stand-in for fake.random_element(elements=...)
+    elements = np.asarray(elements, dtype=object)
+    return elements[rng.integers(0, len(elements), size=num_records)]
+
+
+def _uniform_price(rng, low, high, num_records):
+    # Vectorized stand-in for round(random.uniform(low, high), 2)
+    return np.round(rng.uniform(low, high, size=num_records), 2)
+
+
+def _dates_between(rng, num_records, days_back, end_date=None):
+    # Vectorized stand-in for fake.date_between(start_date='-Ny', end_date='today')
+    end_date = _today() if end_date is None else np.datetime64(end_date, 'D')
+    offsets = rng.integers(0, days_back + 1, size=num_records)
+    return end_date - offsets.astype('timedelta64[D]')
+
+
+def _dates_after(rng, start_dates, end_date=None):
+    # Vectorized stand-in for fake.date_between(start_date=purchase_date, end_date='today')
+    end_date = _today() if end_date is None else np.datetime64(end_date, 'D')
+    remaining = (end_date - start_dates).astype(np.int64)
+    offsets = np.floor(rng.random(len(start_dates)) * (remaining + 1)).astype(np.int64)
+    return start_dates + offsets.astype('timedelta64[D]')
+
+
+def _ids(start_id, num_records):
+    return np.arange(start_id, start_id + num_records, dtype=np.int64)
+
+
+def _key_array(keys, default_size):
+    if keys is None:
+        return np.arange(1, default_size + 1, dtype=np.int64)
+    keys = np.asarray(keys, dtype=np.int64)
+    if len(keys) == 0:
+        raise ValueError("Cannot draw foreign keys from an empty parent key array")
+    return keys
+
+
+@lru_cache(maxsize=32)
+def _zipf_cdf(size, exponent):
+    weights = 1.0 / np.arange(1, size + 1, dtype=np.float64) ** exponent
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def _draw_positions(rng, size, num_records, exponent=None):
+    # Uniform positions in 0..size-1, or Zipf-skewed positions (P(k) ~ 1 / (k+1)**exponent) where position 0 is the hottest
+    if not exponent:
+        return rng.integers(0, size, size=num_records)
+    positions = np.searchsorted(_zipf_cdf(size, float(exponent)), rng.random(num_records), side='right')
+    return np.minimum(positions, size - 1)
+
+
+def _skew(skew, column):
+    return (skew or {}).get(column)
+
+
+def _sample_keys(rng, keys, num_records, exponent=None):
+    # Foreign keys are drawn from the parent's actual keys, so no child row can reference a missing parent. With a skew
+    # exponent the keys at the front of the array are the hot ones; shuffle the array first to scatter them.
+    return keys[_draw_positions(rng, len(keys), num_records, exponent)]
+
+
+def key_space(parent, column):
+    # Sorted unique keys of a parent table given as a DataFrame, a column dictionary, or a path to a CSV file
+    if isinstance(parent, str):
+        parent = pd.read_csv(parent, usecols=[column])
+    return np.unique(np.asarray(parent[column], dtype=np.int64))
+
+
+def find_orphans(child, column, parent_keys):
+    # Boolean mask of child rows whose foreign key is not in parent_keys
+    return ~np.isin(np.asarray(child[column], dtype=np.int64), np.asarray(parent_keys, dtype=np.int64))
+
+
+# 4. Vectorized data generating functions
+#   A. Cars_data
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def generate_cars_columns(num_records, rng=None, start_id=1, skew=None):
+    rng = make_rng(rng)
+    makes, models, years = sample_vehicles(rng, num_records, _skew(skew, 'Make'), _skew(skew, 'Model'))
+    car_ids = _ids(start_id, num_records)
+    return {
+        'CarID': car_ids,
+        'Make': makes,
+        'Model': models,
+        'Year': years,
+        'Mileage': rng.integers(0, 200000, size=num_records, endpoint=True),
+        'VIN': generate_vins(car_ids, rng),
+        'EngineType': _choice(rng, ENGINE_TYPES, num_records),
+        'TransmissionType': _choice(rng, TRANSMISSION_TYPES, num_records),
+        'FuelType': _choice(rng, FUEL_TYPES, num_records),
+    }
+
+
+# 4. Vectorized data generating functions
+#   B. Owners_data
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def generate_owners_columns(num_records, rng=None, start_id=1, car_ids=None, skew=None):
+    rng = make_rng(rng)
+    car_ids = _key_array(car_ids, DEFAULT_NUM_CARS)
+    return {
+        'OwnerID': _ids(start_id, num_records),
+        'CarID': _sample_keys(rng, car_ids, num_records, _skew(skew, 'CarID')),
+        'FirstName': sample_pool(rng, 'first_name', num_records),
+        'LastName': sample_pool(rng, 'last_name', num_records),
+        'ContactInfo': sample_pool(rng, 'email', num_records),
+        'State': sample_pool(rng, 'state_abbr', num_records),
+    }
+
+
+# 4. Vectorized data generating functions
+#   C. OwnershipHistory_data
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def generate_ownership_history_columns(num_records, rng=None, start_id=1, car_ids=None, owner_ids=None, end_date=None,
+                                       skew=None):
+    rng = make_rng(rng)
+    car_ids = _key_array(car_ids, DEFAULT_NUM_CARS)
+    owner_ids = _key_array(owner_ids, DEFAULT_NUM_OWNERS)
+    purchase_dates = _dates_between(rng, num_records, 5 * 365, end_date)
+    return {
+        'OwnershipID': _ids(start_id, num_records),
+        'CarID': _sample_keys(rng, car_ids, num_records, _skew(skew, 'CarID')),
+        'OwnerID': _sample_keys(rng, owner_ids, num_records, _skew(skew, 'OwnerID')),
+        'PurchaseDate': purchase_dates,
+        'SaleDate': _dates_after(rng, purchase_dates, end_date),
+        'SalePrice': _uniform_price(rng, 5000, 50000, num_records),
+    }
+
+
+# Ownership chains: instead of independent rows, every car gets a sorted, non-overlapping sequence of owners with a sale
+# price that depreciates over the life of the car. Rows are grouped by car with a sort, and each row's place in its chain
+# comes from the group start offsets, so no per-car Python loop is needed.
+OWNERSHIP_YEARS_BACK = 5
+ANNUAL_DEPRECIATION = 0.15
+NEW_PRICE_RANGE = (20000, 50000)
+
+
+def _chain_positions(sorted_keys):
+    # For keys sorted into groups: each row's rank within its group, and the group's length repeated on every row
+    num_records = len(sorted_keys)
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) if num_records else np.array([], int)
+    lengths = np.diff(np.r_[starts, num_records])
+    rank = np.arange(num_records) - np.repeat(starts, lengths)
+    return rank, np.repeat(lengths, lengths), starts, lengths
+
+
+def _chain_lengths(rng, num_cars, num_records, max_length, exponent=None, car_partition=None):
+    # Number of ownerships of each car. A chain holds at most max_length ownerships (one purchase day each inside the date
+    # window), so rows drawn beyond that for a hot car spill over onto cars that still have room.
+    if num_records > num_cars * max_length:
+        raise ValueError(f"{num_records:,} ownerships do not fit in chains of at most {max_length:,} for {num_cars:,} cars")
+    if exponent and car_partition is not None:
+        # The skew follows each car's rank in the whole key space, so only the first shard holds the hottest car
+        part, num_parts = car_partition
+        weights = 1.0 / (part + 1 + num_parts * np.arange(num_cars, dtype=np.float64)) ** float(exponent)
+        cdf = np.cumsum(weights) / weights.sum()
+        positions = np.minimum(np.searchsorted(cdf, rng.random(num_records), side='right'), num_cars - 1)
+    else:
+        positions = _draw_positions(rng, num_cars, num_records, exponent)
+    counts = np.bincount(positions, minlength=num_cars)
+    excess = int(np.maximum(counts - max_length, 0).sum())
+    counts = np.minimum(counts, max_length)
+    while excess:
+        open_cars = np.flatnonzero(counts < max_length)
+        counts += np.bincount(open_cars[rng.integers(0, len(open_cars), size=excess)], minlength=num_cars)
+        excess = int(np.maximum(counts - max_length, 0).sum())
+        counts = np.minimum(counts, max_length)
+    return counts
+
+
+def generate_ownership_chains_columns(num_records, rng=None, start_id=1, car_ids=None, owner_ids=None, end_date=None,
+                                      car_partition=None, skew=None):
+    # car_partition=(part, num_parts) limits the cars to every num_parts-th key, so shards generating the same table never
+    # share a car and every chain stays inside one shard
+    rng = make_rng(rng)
+    car_ids = _key_array(car_ids, DEFAULT_NUM_CARS)
+    owner_ids = _key_array(owner_ids, DEFAULT_NUM_OWNERS)
+    if car_partition is not None:
+        part, num_parts = car_partition
+        car_ids = car_ids[part::num_parts]
+        if len(car_ids) == 0:
+            raise ValueError("More ownership shards than cars; use a larger shard/chunk size")
+    end_date = _today() if end_date is None else np.datetime64(end_date, 'D')
+    span = OWNERSHIP_YEARS_BACK * 365
+
+    # Group the rows by car; the number of rows a car receives is the length of its ownership chain
+    counts = _chain_lengths(rng, len(car_ids), num_records, span, _skew(skew, 'CarID'), car_partition)
+    cars = np.sort(np.repeat(car_ids, counts))
+    rank, chain_length, starts, lengths = _chain_positions(cars)
+
+    # Distinct, increasing purchase days within each chain: sorted draws from [0, span - length] plus the row's rank
+    draws = rng.integers(0, np.maximum(span - chain_length + 1, 1))
+    purchase_offsets = draws[np.lexsort((draws, cars))] + rank
+
+    # Each sale falls between the purchase and the day before the next owner's purchase (or the end date for the last owner)
+    is_last = rank == chain_length - 1
+    next_purchase = np.r_[purchase_offsets[1:], span + 1]
+    latest_sale = np.where(is_last, span, next_purchase - 1)
+    gaps = latest_sale - purchase_offsets + 1
+    sale_offsets = purchase_offsets + np.floor(rng.random(num_records) * gaps).astype(np.int64)
+
+    # Price of the car when new, depreciated by the years between the first purchase in its chain and each sale
+    new_prices = np.repeat(rng.uniform(*NEW_PRICE_RANGE, size=len(lengths)), lengths)
+    first_purchase = np.repeat(purchase_offsets[starts], lengths)
+    age_years = (sale_offsets - first_purchase) / 365.0
+    sale_prices = np.round(new_prices * (1 - ANNUAL_DEPRECIATION) ** age_years, 2)
+
+    window_start = end_date - np.timedelta64(span, 'D')
+    return {
+        'OwnershipID': _ids(start_id, num_records),
+        'CarID': cars,
+        'OwnerID': _sample_keys(rng, owner_ids, num_records, _skew(skew, 'OwnerID')),
+        'PurchaseDate': window_start + purchase_offsets.astype('timedelta64[D]'),
+        'SaleDate': window_start + sale_offsets.astype('timedelta64[D]'),
+        'SalePrice': sale_prices,
+    }
+
+
+# 4. Vectorized data generating functions
+#   D. VehicleCondition_data
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def generate_vehicle_condition_columns(num_records, rng=None, start_id=1, car_ids=None, skew=None):
+    rng = make_rng(rng)
+    car_ids = _key_array(car_ids, DEFAULT_NUM_CARS)
+    return {
+        'ConditionID': _ids(start_id, num_records),
+        'CarID': _sample_keys(rng, car_ids, num_records, _skew(skew, 'CarID')),
+        'OverallCondition': _choice(rng, OVERALL_CONDITIONS, num_records),
+        'ExteriorCondition': _choice(rng, EXTERIOR_CONDITIONS, num_records),
+        'InteriorCondition': _choice(rng, INTERIOR_CONDITIONS, num_records),
+    }
+
+
+# 4. Vectorized data generating functions
+#   E. Features_data
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def generate_features_columns(num_records, rng=None, start_id=1, car_ids=None, skew=None):
+    rng = make_rng(rng)
+    car_ids = _key_array(car_ids, DEFAULT_NUM_CARS)
+    return {
+        'FeatureID': _ids(start_id, num_records),
+        'CarID': _sample_keys(rng, car_ids, num_records, _skew(skew, 'CarID')),
+        'FeatureName': _choice(rng, FEATURES_LIST, num_records),
+        'FeatureValue': _choice(rng, FEATURE_VALUES, num_records),
+    }
+
+
+# 4. Vectorized data generating functions
+#   F. Incidents_data
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def generate_incidents_columns(num_records, rng=None, start_id=1, car_ids=None, end_date=None, skew=None):
+    rng = make_rng(rng)
+    car_ids = _key_array(car_ids, DEFAULT_NUM_CARS)
+    return {
+        'IncidentID': _ids(start_id, num_records),
+        'CarID': _sample_keys(rng, car_ids, num_records, _skew(skew, 'CarID')),
+        'IncidentDate': _dates_between(rng, num_records, 365, end_date),
+        'Description': _choice(rng, INCIDENT_DESCRIPTIONS, num_records),
+        'Cost': _uniform_price(rng, 5000, 15000, num_records),
+    }
+
+
+# 4. Vectorized data generating functions
+#   G. ServiceHistory_data
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def generate_service_history_columns(num_records, rng=None, start_id=1, car_ids=None, end_date=None, skew=None):
+    rng = make_rng(rng)
+    car_ids = _key_array(car_ids, DEFAULT_NUM_CARS)
+    return {
+        'ServiceID': _ids(start_id, num_records),
+        'CarID': _sample_keys(rng, car_ids, num_records, _skew(skew, 'CarID')),
+        'ServiceDate': _dates_between(rng, num_records, 3 * 365, end_date),
+        'ServiceType': _choice(rng, SERVICE_TYPES, num_records),
+        'Cost': _uniform_price(rng, 50, 1500, num_records),
+    }
+
+
+# 4. Vectorized data generating functions
+#   H. MarketTrends_data
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def generate_market_trends_columns(num_records, rng=None, start_id=1, car_ids=None, end_date=None, skew=None):
+    rng = make_rng(rng)
+    car_ids = _key_array(car_ids, DEFAULT_NUM_CARS)
+    return {
+        'TrendID': _ids(start_id, num_records),
+        'CarID': _sample_keys(rng, car_ids, num_records, _skew(skew, 'CarID')),
+        'Date': _dates_between(rng, num_records, 8 * 365, end_date),
+        'AverageSalePrice': _uniform_price(rng, 10000, 40000, num_records),
+        'MarketDemand': rng.integers(10, 100, size=num_records, endpoint=True),
+    }
+
+
+# Lookup of table name to its generating function. OwnershipHistory uses the ownership chains; the independent-row version
+# generate_ownership_history_columns() matches the original function and remains available.
+GENERATORS = {
+    'Cars': generate_cars_columns,
+    'Owners': generate_owners_columns,
+    'OwnershipHistory': generate_ownership_chains_columns,
+    'VehicleCondition': generate_vehicle_condition_columns,
+    'Features': generate_features_columns,
+    'Incidents': generate_incidents_columns,
+    'ServiceHistory': generate_service_history_columns,
+    'MarketTrends': generate_market_trends_columns,
+}
+
+
+# 5. Output helpers
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def columns_to_rows(columns):
+    # List of tuples in the same shape as the original generate_*_data() functions, ready for cursor.executemany().
+    # .tolist() turns numpy scalars into Python ints, floats and datetime.date objects that mysql.connector understands.
+    return list(zip(*(np.asarray(values).tolist() for values in columns.values())))
+
+
+def columns_to_frame(columns):
+    return pd.DataFrame(columns)
+
+
+def generate_table(table, num_records, rng=None, **kwargs):
+    return columns_to_frame(GENERATORS[table](num_records, rng=rng, **kwargs))
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module builds a make -> model -> year catalog of NumPy arrays from the faker_vehicle vehicle list and samples
+# whole columns of valid (Make, Model, Year) combinations from it, instead of drawing make, model and year separately.
+#
+#    Building the Catalog: the distinct (Make, Model, Year) rows are sorted so every make owns a contiguous block of
+#    models and every model a contiguous block of years, with the block offsets and counts kept as arrays. Makes and models
+#    are ordered from largest to smallest, so position 0 is the hottest value for skewed sampling.
+#
+#    Sampling: without skew a catalog row is drawn uniformly. With skew a make is drawn first, then a model of that make,
+#    then a year of that model. The per-make model distributions are one flat cumulative array in which make k occupies
+#    (k, k + 1], so one searchsorted() call on make + uniform draw picks a model of the right make for every row.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from faker_vehicle.vehicle_dict import vehicles
+
+
+# 2. Building the catalog
+# ---------------------------------------------------------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def load_catalog():
+    frame = pd.DataFrame(vehicles, columns=['Make', 'Model', 'Year', 'Category'])[['Make', 'Model', 'Year']]
+    frame = frame.drop_duplicates()
+    frame['make_rows'] = frame.groupby('Make')['Year'].transform('size')
+    frame['model_rows'] = frame.groupby(['Make', 'Model'])['Year'].transform('size')
+    frame = frame.sort_values(['make_rows', 'Make', 'model_rows', 'Model', 'Year'],
+                              ascending=[False, True, False, True, True]).reset_index(drop=True)
+
+    # One entry per (Make, Model) pair: where its years start in the row arrays and how many there are
+    pair_change = np.r_[True, (frame['Make'].to_numpy()[1:] != frame['Make'].to_numpy()[:-1])
+                        | (frame['Model'].to_numpy()[1:] != frame['Model'].to_numpy()[:-1])]
+    pair_start = np.flatnonzero(pair_change)
+    pair_count = np.diff(np.r_[pair_start, len(frame)])
+
+    # One entry per make: where its pairs start in the pair arrays and how many there are
+    pair_makes = frame['Make'].to_numpy()[pair_start]
+    make_change = np.r_[True, pair_makes[1:] != pair_makes[:-1]]
+    make_pair_start = np.flatnonzero(make_change)
+    make_pair_count = np.diff(np.r_[make_pair_start, len(pair_start)])
+
+    return {
+        'make': frame['Make'].to_numpy(dtype=object),
+        'model': frame['Model'].to_numpy(dtype=object),
+        'year': frame['Year'].to_numpy(dtype=np.int64),
+        'pair_start': pair_start,
+        'pair_count': pair_count,
+        'make_names': pair_makes[make_pair_start],
+        'make_pair_start': make_pair_start,
+        'make_pair_count': make_pair_count,
+        'make_rows': np.add.reduceat(pair_count, make_pair_start),
+    }
+
+
+def _normalized_cdf(weights):
+    cdf = np.cumsum(weights, dtype=np.float64)
+    return cdf / cdf[-1]
+
+
+def _zipf_weights(ranks, exponent):
+    return 1.0 / (ranks + 1.0) ** exponent
+
+
+@lru_cache(maxsize=32)
+def _make_cdf(exponent):
+    catalog = load_catalog()
+    if exponent:
+        return _normalized_cdf(_zipf_weights(np.arange(len(catalog['make_names'])), exponent))
+    # Unskewed makes are weighted by their number of catalog rows, matching a uniform draw of rows
+    return _normalized_cdf(catalog['make_rows'])
+
+
+@lru_cache(maxsize=32)
+def _model_cdf(exponent):
+    # Flat array: the cumulative model distribution of make k, shifted into (k, k + 1]
+    catalog = load_catalog()
+    starts, counts = catalog['make_pair_start'], catalog['make_pair_count']
+    make_of_pair = np.repeat(np.arange(len(starts)), counts)
+    rank_in_make = np.arange(len(make_of_pair)) - np.repeat(starts, counts)
+    weights = _zipf_weights(rank_in_make, exponent) if exponent else catalog['pair_count'].astype(np.float64)
+    cumulative = np.cumsum(weights)
+    before_make = np.repeat(cumulative[starts] - weights[starts], counts)
+    make_totals = np.repeat(np.add.reduceat(weights, starts), counts)
+    within = (cumulative - before_make) / make_totals
+    within[starts + counts - 1] = 1.0
+    return make_of_pair + within
+
+
+# 3. Sampling
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def sample_vehicles(rng, num_records, make_exponent=None, model_exponent=None):
+    # Returns Make, Model and Year arrays in which every row is a combination that exists in the catalog
+    catalog = load_catalog()
+    if not make_exponent and not model_exponent:
+        rows = rng.integers(0, len(catalog['year']), size=num_records)
+    else:
+        num_makes = len(catalog['make_names'])
+        makes = np.minimum(np.searchsorted(_make_cdf(make_exponent), rng.random(num_records), side='right'),
+                           num_makes - 1)
+        pairs = np.searchsorted(_model_cdf(model_exponent), makes + rng.random(num_records), side='right')
+        last_pair = catalog['make_pair_start'][makes] + catalog['make_pair_count'][makes] - 1
+        pairs = np.minimum(pairs, last_pair)
+        counts = catalog['pair_count'][pairs]
+        rows = catalog['pair_start'][pairs] + np.floor(rng.random(num_records) * counts).astype(np.int64)
+    return catalog['make'][rows], catalog['model'][rows], catalog['year'][rows]
+
+
+def catalog_frame():
+    # The catalog as a DataFrame, e.g. for joining or checking that generated pairs are valid
+    catalog = load_catalog()
+    return pd.DataFrame({'Make': catalog['make'], 'Model': catalog['model'], 'Year': catalog['year']})
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------
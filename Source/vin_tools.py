@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ## Python Script Overview
+#
+# This module generates unique, check-digit-valid Vehicle Identification Numbers (VINs) in bulk and finds invalid or
+# duplicate VINs in existing data.
+#
+#    VIN Rules: the 33 characters allowed in a VIN, their transliteration values and the position weights of the check
+#    digit (position 9) in ISO 3779 / 49 CFR 565.
+#
+#    Bulk VIN Generation: VINs are built as a (rows x 17) character array. The last seven characters are a serial number
+#    derived from the CarID through a fixed one-to-one shuffle, so two CarIDs never share a VIN however the table was
+#    sharded. The other characters are random and the check digit is computed for every row at once.
+#
+#    Validation and Duplicate Detection: a vectorized check digit test and a duplicate finder that works on a DataFrame
+#    or directly on a CSV file such as Data/Cars_df.csv.
+
+# # ----------------------------------- Start Python Script -----------------------------------------------
+
+# 1. Importing Necessary Libraries
+# ---------------------------------------------------------------------------------------------------------------------------
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+# 2. VIN rules
+# ---------------------------------------------------------------------------------------------------------------------------
+
+VIN_LENGTH = 17
+VIN_ALPHABET = b'0123456789ABCDEFGHJKLMNPRSTUVWXYZ'   # I, O and Q are not allowed
+VIN_CHARS = np.frombuffer(VIN_ALPHABET, dtype=np.uint8)
+
+VIN_WEIGHTS = np.array([8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int64)
+CHECK_DIGIT_POSITION = 8   # zero based, i.e. the 9th character
+
+# Transliteration table indexed by ASCII code; -1 marks characters that may not appear in a VIN
+TRANSLITERATION = np.full(256, -1, dtype=np.int64)
+TRANSLITERATION[np.frombuffer(b'0123456789', dtype=np.uint8)] = np.arange(10)
+for _letters, _values in ((b'ABCDEFGH', range(1, 9)), (b'JKLMN', range(1, 6)), (b'P', [7]), (b'R', [9]),
+                          (b'STUVWXYZ', range(2, 10))):
+    TRANSLITERATION[np.frombuffer(_letters, dtype=np.uint8)] = list(_values)
+
+CHECK_CHARS = np.frombuffer(b'0123456789X', dtype=np.uint8)
+
+# The serial part (positions 11-17) holds 33**7 different values. Multiplying by a number that shares no factor with 33**7
+# shuffles the CarIDs across that range one-to-one, so consecutive cars do not get consecutive serial numbers.
+SERIAL_LENGTH = 7
+SERIAL_SPACE = len(VIN_CHARS) ** SERIAL_LENGTH
+SERIAL_MULTIPLIER = 1000003
+SERIAL_OFFSET = 918273645
+
+
+# 3. Bulk VIN generation
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def _check_digits(codes):
+    weighted = TRANSLITERATION[codes] * VIN_WEIGHTS
+    return CHECK_CHARS[weighted.sum(axis=1) % 11]
+
+
+def _serial_codes(serials):
+    # Base-33 digits of each serial number, most significant first
+    serials = (np.asarray(serials, dtype=np.int64) * SERIAL_MULTIPLIER + SERIAL_OFFSET) % SERIAL_SPACE
+    powers = len(VIN_CHARS) ** np.arange(SERIAL_LENGTH - 1, -1, -1, dtype=np.int64)
+    return VIN_CHARS[(serials[:, None] // powers) % len(VIN_CHARS)]
+
+
+def _codes_to_strings(codes):
+    strings = np.ascontiguousarray(codes, dtype=np.uint8).view(f'S{VIN_LENGTH}').ravel()
+    return strings.astype(f'U{VIN_LENGTH}').astype(object)
+
+
+def generate_vins(serials, rng):
+    # One VIN per serial number (normally the CarID). Distinct serials below SERIAL_SPACE always give distinct VINs.
+    serials = np.asarray(serials, dtype=np.int64)
+    if len(serials) and (serials.min() < 0 or serials.max() >= SERIAL_SPACE):
+        raise ValueError(f"VIN serial numbers must be between 0 and {SERIAL_SPACE - 1}")
+    codes = np.empty((len(serials), VIN_LENGTH), dtype=np.uint8)
+    codes[:, :10] = VIN_CHARS[rng.integers(0, len(VIN_CHARS), size=(len(serials), 10))]
+    codes[:, 10:] = _serial_codes(serials)
+    codes[:, CHECK_DIGIT_POSITION] = ord('0')
+    codes[:, CHECK_DIGIT_POSITION] = _check_digits(codes)
+    return _codes_to_strings(codes)
+
+
+# 4. Validation and duplicate detection
+# ---------------------------------------------------------------------------------------------------------------------------
+
+def check_digit_valid(vins):
+    # Boolean mask: True where the VIN is 17 allowed characters with a correct check digit
+    vins = np.char.upper(np.asarray(pd.Series(vins, dtype=object).fillna('').astype(str).to_numpy(), dtype=str))
+    valid = np.char.str_len(vins) == VIN_LENGTH
+    codes = np.zeros((len(vins), VIN_LENGTH), dtype=np.uint32)
+    codes[valid] = vins[valid].astype(f'U{VIN_LENGTH}').view(np.uint32).reshape(-1, VIN_LENGTH)
+    codes[codes > 255] = 0   # non-ASCII code points are never allowed
+    valid &= (TRANSLITERATION[codes] >= 0).all(axis=1)
+    codes[~valid] = ord('0')
+    return valid & (_check_digits(codes) == codes[:, CHECK_DIGIT_POSITION])
+
+
+def find_duplicate_vins(cars, vin_column='VIN'):
+    # Rows of Cars whose VIN appears more than once, sorted by VIN. 'cars' can be a DataFrame or a path to a CSV file.
+    if isinstance(cars, str):
+        header = pd.read_csv(cars, nrows=0).columns
+        cars = pd.read_csv(cars, usecols=[column for column in ('CarID', vin_column) if column in header])
+    duplicated = cars[vin_column].duplicated(keep=False).to_numpy()
+    return cars[duplicated].sort_values(vin_column)
+
+
+def vin_report(cars, vin_column='VIN'):
+    if isinstance(cars, str):
+        cars = pd.read_csv(cars)
+    duplicates = find_duplicate_vins(cars, vin_column)
+    return {
+        'rows': len(cars),
+        'duplicate_rows': len(duplicates),
+        'duplicate_vins': duplicates[vin_column].nunique(),
+        'invalid_check_digits': int((~check_digit_valid(cars[vin_column])).sum()),
+    }
+
+
+if __name__ == '__main__':
+    # Usage: python vin_tools.py ../Data/Cars_df.csv [more CSV files]
+    for path in sys.argv[1:]:
+        print(path, vin_report(path))
+
+
+# # ----------------------------------- END Python Script -----------------------------------------------